@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import Group
-from .models import User, UserProfile, Event
+from .models import User, UserProfile, Event, EventChange, ArchivedEvent
 from django.shortcuts import render
 from django.http import HttpResponseRedirect
 from django.urls import path
@@ -10,6 +10,11 @@ from django.template.response import TemplateResponse
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django import forms
+from django.http import Http404
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count, Q
+from . import campus, profiling
+from .archive import restore_events
 
 # Custom Event Admin Form
 class EventAdminForm(forms.ModelForm):
@@ -48,6 +53,27 @@ class EventAdminForm(forms.ModelForm):
             }),
         }
 
+class StartsAtFilter(admin.SimpleListFilter):
+    """Filter events by start time using range queries on starts_at"""
+    title = 'start time'
+    parameter_name = 'when'
+
+    def lookups(self, request, model_admin):
+        return (
+            ('upcoming', 'Upcoming'),
+            ('week', 'Next 7 days'),
+            ('past', 'Past'),
+        )
+
+    def queryset(self, request, queryset):
+        if self.value() == 'upcoming':
+            return queryset.upcoming()
+        if self.value() == 'week':
+            return queryset.starting_within(7)
+        if self.value() == 'past':
+            return queryset.past()
+        return queryset
+
 # Unregister the Group model since we don't need it for this project
 admin.site.unregister(Group)
 
@@ -60,14 +86,73 @@ class CustomAdminSite(AdminSite):
         
         # Add statistics to the context
         extra_context.update({
-            'events_count': Event.objects.count(),
-            'pending_events': Event.objects.filter(status='pending').count(),
-            'approved_events': Event.objects.filter(status='approved').count(),
+            'events_count': Event.all_objects.count(),
+            'pending_events': Event.all_objects.filter(status='pending').count(),
+            'approved_events': Event.all_objects.filter(status='approved').count(),
             'users_count': User.objects.count(),
         })
         
         return super().index(request, extra_context)
 
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path('profiles/', self.admin_view(self.profiles_view), name='profiles'),
+            path('profiles/<str:name>/', self.admin_view(self.profile_detail_view), name='profile-detail'),
+            path('campuses/', self.admin_view(self.campus_stats_view), name='campus-stats'),
+        ]
+        return custom_urls + urls
+
+    def profiles_view(self, request):
+        """List captured request profiles (staff only)"""
+        context = {
+            **self.each_context(request),
+            'title': 'Captured Profiles',
+            'profiles': profiling.list_profiles(),
+            'profile_dir': profiling.profile_dir(),
+        }
+        return TemplateResponse(request, 'admin/profiles.html', context)
+
+    def profile_detail_view(self, request, name):
+        """Show the top cumulative functions of one captured profile"""
+        try:
+            rows = profiling.load_profile(name)
+        except (FileNotFoundError, OSError, ValueError):
+            raise Http404("Profile not found")
+        context = {
+            **self.each_context(request),
+            'title': f'Profile: {name}',
+            'name': name,
+            'rows': rows,
+        }
+        return TemplateResponse(request, 'admin/profile_detail.html', context)
+
+    def campus_stats_view(self, request):
+        """Event and user counts for every campus, queried in parallel (superusers only)"""
+        if not request.user.is_superuser:
+            raise PermissionDenied
+        results = campus.fan_out(campus_stats)
+        context = {
+            **self.each_context(request),
+            'title': 'Campus Statistics',
+            'campuses': [
+                {'slug': slug, 'database': campus.database_for(slug), **entry}
+                for slug, entry in results.items()
+            ],
+        }
+        return TemplateResponse(request, 'admin/campus_stats.html', context)
+
+
+def campus_stats(slug):
+    """Counts for the active campus; runs once per campus inside ``campus.fan_out``"""
+    stats = Event.all_objects.aggregate(
+        events=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        approved=Count('id', filter=Q(status='approved')),
+    )
+    stats['users'] = User.objects.count()
+    return stats
+
 # Use custom admin site
 admin_site = CustomAdminSite(name='custom_admin')
 
@@ -136,10 +221,10 @@ admin.site.index_title = "Event Management Dashboard"
 class EventAdmin(admin.ModelAdmin):
     form = EventAdminForm  # Use custom form
     list_display = ('title', 'category', 'organizer', 'date', 'status_display', 'image_preview', 'get_deletion_status', 'styling_applied', 'days_since_submission')
-    list_filter = ('status', 'category', 'date', 'styling_applied', 'deleted_at', 'is_featured')
+    list_filter = ('status', 'category', StartsAtFilter, 'styling_applied', 'deleted_at', 'is_featured')
     search_fields = ('title', 'description', 'organizer__user__username', 'organizer__user__email')
     actions = ['approve_events', 'deny_events', 'delete_events', 'feature_events', 'bulk_approve_pending']
-    ordering = ('-date', 'status')
+    ordering = ('-starts_at', 'status')
     readonly_fields = ('image_preview_large', 'submission_info')
     list_per_page = 25
     
@@ -176,6 +261,14 @@ class EventAdmin(admin.ModelAdmin):
 
 
     
+    def get_queryset(self, request):
+        """Admins see soft-deleted events too"""
+        return Event.objects.with_deleted()
+
+    def save_model(self, request, obj, form, change):
+        """Record the admin as the actor in the event change log"""
+        obj.save(actor=request.user)
+
     def get_deletion_status(self, obj):
         if obj.is_deleted:
             return f"🗑️ Deleted on {obj.deleted_at.strftime('%Y-%m-%d %H:%M')} by {obj.deleted_by.username if obj.deleted_by else 'Unknown'}"
@@ -186,7 +279,7 @@ class EventAdmin(admin.ModelAdmin):
         approved_count = 0
         for event in queryset:
             event.status = 'approved'
-            event.save()  # Save first to update status
+            event.save(actor=request.user)  # Save first to update status
             event.apply_auto_styling()  # Then apply auto-styling
             approved_count += 1
         
@@ -221,7 +314,7 @@ class EventAdmin(admin.ModelAdmin):
         featured_count = 0
         for event in queryset.filter(status='approved'):
             event.is_featured = True
-            event.save()
+            event.save(actor=request.user)
             featured_count += 1
         
         self.message_user(request, f"{featured_count} events have been marked as featured.")
@@ -234,7 +327,7 @@ class EventAdmin(admin.ModelAdmin):
         
         for event in pending_events:
             event.status = 'approved'
-            event.save()
+            event.save(actor=request.user)
             event.apply_auto_styling()
             approved_count += 1
         
@@ -244,22 +337,17 @@ class EventAdmin(admin.ModelAdmin):
     def days_since_submission(self, obj):
         """Show how many days since event was submitted"""
         from django.utils import timezone
-        from datetime import timedelta
         
-        # Use creation timestamp from the model (you might need to add this field)
-        # For now, we'll estimate based on the event date
-        today = timezone.now().date()
-        days_diff = (today - obj.date).days
+        days_diff = (timezone.now() - obj.created_at).days
         
-        if days_diff < 0:
-            return format_html('<span style="color: #28a745; font-weight: bold;">📅 Future event</span>')
-        elif days_diff == 0:
+        if days_diff == 0:
             return format_html('<span style="color: #ffc107; font-weight: bold;">📅 Today</span>')
         elif days_diff <= 7:
             return format_html('<span style="color: #17a2b8;">📅 {} days ago</span>', days_diff)
         else:
             return format_html('<span style="color: #6c757d;">📅 {} days ago</span>', days_diff)
     days_since_submission.short_description = 'Submitted'
+    days_since_submission.admin_order_field = 'created_at'
 
     def submission_info(self, obj):
         """Display submission and approval information"""
@@ -267,6 +355,7 @@ class EventAdmin(admin.ModelAdmin):
         
         # Organizer info
         info_lines.append(f"👤 Submitted by: <strong>{obj.organizer.user.get_full_name() or obj.organizer.user.username}</strong>")
+        info_lines.append(f"🕒 Submitted: {obj.created_at:%Y-%m-%d %H:%M} · Last changed: {obj.updated_at:%Y-%m-%d %H:%M}")
         info_lines.append(f"📧 Contact: {obj.organizer.user.email}")
         
         # Status info
@@ -279,9 +368,9 @@ class EventAdmin(admin.ModelAdmin):
         
         # Event timing
         from django.utils import timezone
-        today = timezone.now().date()
-        if obj.date >= today:
-            days_until = (obj.date - today).days
+        now = timezone.now()
+        if obj.starts_at and obj.starts_at >= now:
+            days_until = (obj.starts_at - now).days
             if days_until == 0:
                 info_lines.append('<span style="color: #ffc107; font-weight: bold;">📅 Event is today!</span>')
             elif days_until <= 7:
@@ -295,10 +384,10 @@ class EventAdmin(admin.ModelAdmin):
     submission_info.short_description = 'Submission Details'
 
     def deny_event_view(self, request, event_id):
-        event = Event.objects.get(id=event_id)
+        event = Event.all_objects.get(id=event_id)
         if request.method == 'POST':
             event.status = 'denied'
-            event.save()
+            event.save(actor=request.user)
             self.message_user(request, "Event has been denied.")
             return HttpResponseRedirect("../../")
         
@@ -377,4 +466,44 @@ class EventAdmin(admin.ModelAdmin):
                 'Organizer Upload' if obj.event_flyer else 'Stock Image'
             )
         return format_html('<div style="padding: 15px; text-align: center; color: #999; border: 2px dashed #ddd; border-radius: 8px;">⏳ Generated after approval</div>')
-    featured_image_preview.short_description = '🌟 Featured Image (Auto-Generated)'
\ No newline at end of file
+    featured_image_preview.short_description = '🌟 Featured Image (Auto-Generated)'
+
+
+@admin.register(EventChange)
+class EventChangeAdmin(admin.ModelAdmin):
+    """Read-only view of the append-only event change log"""
+    list_display = ('sequence', 'event', 'action', 'status', 'actor', 'changed_at')
+    list_filter = ('action', 'status')
+    search_fields = ('event__title',)
+    list_select_related = ('event', 'actor')
+    list_per_page = 50
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedEvent)
+class ArchivedEventAdmin(admin.ModelAdmin):
+    """Browse archived events and restore them to the live table"""
+    list_display = ('title', 'original_id', 'category', 'starts_at', 'status', 'archive_reason', 'archived_at')
+    list_filter = ('archive_reason', 'status', 'category')
+    search_fields = ('title', 'description')
+    actions = ['restore_selected']
+    list_per_page = 50
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def restore_selected(self, request, queryset):
+        restored = restore_events(list(queryset.values_list('original_id', flat=True)))
+        self.message_user(request, f"{len(restored)} events have been restored to the live table.")
+    restore_selected.short_description = "♻️ Restore selected events"
@@ -0,0 +1,174 @@
+"""
+=========================================
+ORGANIZER ANALYTICS
+=========================================
+
+Daily views, bookmarks and registration-link clicks per event, charted on
+the organizer dashboard.
+
+Three stages keep each step cheap:
+1. Recording: interactions land in the append-only ``InteractionLog``
+   already aggregated. Views and clicks go through the write-behind
+   buffers in ``accounts.counters``, which write one row per event per
+   flush. Bookmarks are written with each sync. Nothing is written per
+   request.
+2. Rollup: ``rollup()`` (``manage.py rollup_analytics``, per campus) reads
+   only the log rows after its ``ChangeCursor``, plus the RESCAN rows
+   before it in case one committed late. It recomputes the
+   ``EventDailyStats`` rows for the (event, day) pairs they touch, then the
+   ``OrganizerDailyStats`` rows for the affected (organizer, day) pairs.
+   Rows are recomputed from sums rather than incremented, so re-running
+   after a crash, or reading a log row twice, is safe. Log rows already rolled up are deleted once they
+   are older than ANALYTICS_LOG_RETENTION_DAYS.
+3. Serving: ``dashboard_data()`` reads the chart window from both rollup
+   tables in one query, a UNION ALL of a range scan on each table's
+   (organizer, day) index.
+"""
+
+import datetime
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import IntegerField, Sum, Value
+from django.utils import timezone
+
+from .models import ChangeCursor, Event, EventDailyStats, InteractionLog, OrganizerDailyStats
+
+CURSOR = "analytics_rollup"
+RESCAN = 5000  # Log rows re-read behind the cursor; a flush may insert hundreds in one late commit
+METRICS = {InteractionLog.VIEW: "views", InteractionLog.BOOKMARK: "bookmarks", InteractionLog.CLICK: "clicks"}
+
+
+def log(kind, counts, day=None):
+    """
+    Append ``{event_id: count}`` interactions of ``kind`` that happened on
+    ``day`` (default today): one INSERT for the batch.
+    """
+    day = day or timezone.localdate()
+    InteractionLog.objects.bulk_create(
+        [InteractionLog(event_id=event_id, kind=kind, day=day, count=count) for event_id, count in counts.items()]
+    )
+
+
+def _chunks(items, size):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _event_totals(pairs, batch_size):
+    """``{(event_id, day): Counter(metric=total)}`` over the whole log for ``pairs``."""
+    totals = defaultdict(Counter)
+    days = {day for _event_id, day in pairs}
+    for event_ids in _chunks({event_id for event_id, _day in pairs}, batch_size):
+        rows = (
+            InteractionLog.objects.filter(event_id__in=event_ids, day__in=days)
+            .values_list("event_id", "day", "kind").annotate(total=Sum("count")).order_by()
+        )
+        for event_id, day, kind, total in rows:
+            if (event_id, day) in pairs:
+                totals[(event_id, day)][METRICS[kind]] = total
+    return totals
+
+
+def _save(model, unique_fields, rows, batch_size):
+    model.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=[field for field in ("organizer", "views", "bookmarks", "clicks") if field not in unique_fields],
+        batch_size=batch_size,
+    )
+
+
+def rollup(batch_size=500):
+    """
+    Fold log rows added since the last run into the active campus's daily stats tables.
+
+    Returns ``(log_rows, event_days, organizer_days)`` processed.
+    """
+    cursor, _ = ChangeCursor.objects.get_or_create(name=CURSOR)
+    latest = InteractionLog.objects.order_by("-id").values_list("id", flat=True).first() or cursor.sequence
+    new_rows = InteractionLog.objects.filter(id__gt=max(cursor.sequence - RESCAN, 0), id__lte=latest)
+    processed = new_rows.count()
+    pairs = set(new_rows.values_list("event_id", "day").distinct().order_by())
+
+    organizers = {}
+    for event_ids in _chunks({event_id for event_id, _day in pairs}, batch_size):
+        organizers.update(Event.all_objects.filter(pk__in=event_ids).values_list("pk", "organizer_id"))
+    # Events archived since they were logged have no live row left to attribute them to
+    pairs = {pair for pair in pairs if pair[0] in organizers}
+
+    totals = _event_totals(pairs, batch_size)
+    organizer_days = {(organizers[event_id], day) for event_id, day in pairs}
+
+    with transaction.atomic(using=router.db_for_write(EventDailyStats)):
+        _save(EventDailyStats, ["event", "day"], [
+            EventDailyStats(event_id=event_id, day=day, organizer_id=organizers[event_id], **totals[(event_id, day)])
+            for event_id, day in pairs
+        ], batch_size)
+
+        # Organizer totals for the touched days, recomputed from the event rows
+        days = {day for _organizer_id, day in organizer_days}
+        organizer_rows = []
+        for organizer_ids in _chunks({organizer_id for organizer_id, _day in organizer_days}, batch_size):
+            sums = (
+                EventDailyStats.objects.filter(organizer_id__in=organizer_ids, day__in=days)
+                .values("organizer_id", "day")
+                .annotate(views=Sum("views"), bookmarks=Sum("bookmarks"), clicks=Sum("clicks")).order_by()
+            )
+            organizer_rows += [
+                OrganizerDailyStats(**row) for row in sums if (row["organizer_id"], row["day"]) in organizer_days
+            ]
+        _save(OrganizerDailyStats, ["organizer", "day"], organizer_rows, batch_size)
+
+        ChangeCursor.objects.filter(pk=cursor.pk).update(sequence=latest)
+        cutoff = timezone.localdate() - datetime.timedelta(days=settings.ANALYTICS_LOG_RETENTION_DAYS)
+        InteractionLog.objects.filter(id__lte=latest, day__lt=cutoff).delete()
+
+    return processed, len(pairs), len(organizer_rows)
+
+
+def dashboard_data(organizer, events, days=None):
+    """
+    Chart data for the organizer dashboard over the last ``days`` days.
+
+    ``{"days": [...], "total": {metric: [...]}, "events": {id: {"title",
+    metric: [...]}}}``, zero-filled. Reads the two rollup tables only, in
+    one query; organizer totals come back with ``event_id`` None.
+    """
+    days = days or settings.ANALYTICS_CHART_DAYS
+    today = timezone.localdate()
+    start = today - datetime.timedelta(days=days - 1)
+    axis = [start + datetime.timedelta(days=offset) for offset in range(days)]
+    position = {day: index for index, day in enumerate(axis)}
+
+    def series():
+        return {metric: [0] * days for metric in METRICS.values()}
+
+    # Bounded on both sides: a row dated after today (clock skew, a late
+    # flush across midnight elsewhere) has no place on the axis
+    window = {"organizer": organizer, "day__range": (start, today)}
+    columns = ("day", *METRICS.values(), "event_id")
+    rows = (
+        OrganizerDailyStats.objects.filter(**window)
+        .annotate(event_id=Value(None, output_field=IntegerField()))
+        .values(*columns)
+        .union(EventDailyStats.objects.filter(**window).values(*columns), all=True)
+    )
+
+    total = series()
+    titles = {event.pk: event.title for event in events}
+    per_event = {}
+    for row in rows:
+        if row["event_id"] is None:
+            entry = total
+        elif row["event_id"] in titles:
+            entry = per_event.setdefault(row["event_id"], {"title": titles[row["event_id"]], **series()})
+        else:
+            continue  # Deleted since
+        for metric in METRICS.values():
+            entry[metric][position[row["day"]]] = row[metric]
+
+    return {"days": [day.isoformat() for day in axis], "total": total, "events": per_event}
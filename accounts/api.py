@@ -0,0 +1,330 @@
+"""
+=========================================
+EVENT READ API (v1)
+=========================================
+
+Machine-readable access to approved events for the mobile app and other
+integrations, instead of scraping the HTML pages:
+
+- ``GET /api/v1/events/``: upcoming events, oldest start first
+- ``GET /api/v1/events/<id>/``: one event, with its full description
+- ``GET /api/v1/events/batch/?ids=3,17,42``: current card data for up to
+  API_BATCH_MAX_IDS events in one query, e.g. to refresh a saved list;
+  signed-in users only. Events that were removed are flagged, and so are
+  the user's saved or own events that were denied or sent back to review
+- ``GET/POST /api/v1/bookmarks/``: the signed-in user's saved events; POST
+  a batch of add/remove operations to sync them (see ``accounts.bookmarks``)
+
+Query parameters:
+- ``fields``: comma-separated subset of the fields below (sparse fieldsets)
+- ``category``: one or more comma-separated category keys
+- ``from`` / ``to``: inclusive ``YYYY-MM-DD`` start date range; ``from``
+  defaults to today
+- ``limit`` and ``cursor``: cursor pagination; follow ``next`` for the next
+  page. Cursors encode the last (starts_at, id) seen, so pages stay stable
+  while events are added and each page is an index range scan, however
+  deep the client pages.
+
+Rows are read from the ``EventFeedItem`` read model with ``.values()`` and
+mapped to plain dicts: no model instances, no joins for the list.
+
+Responses carry an ``ETag`` and ``Last-Modified`` derived from the newest
+``EventChange`` row, so unchanged data costs the client a 304 and the
+server a single primary-key lookup. Responses are gzipped when the client
+accepts it. Organizer renames are not event changes; they show up after
+the next change to an event.
+"""
+
+import base64
+import binascii
+import datetime
+import hashlib
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import condition, require_GET, require_http_methods
+
+from . import bookmarks, campus
+from .models import Bookmark, Event, EventChange, EventFeedItem
+
+
+# API field name -> EventFeedItem column
+LIST_FIELDS = {
+    "id": "event_id",
+    "title": "title",
+    "category": "category",
+    "category_label": "category_label",
+    "date": "date",
+    "time": "time",
+    "starts_at": "starts_at",
+    "location": "location",
+    "organizer": "organizer_name",
+    "summary": "summary",
+    "image_url": "image_url",
+    "color_theme": "color_theme",
+    "is_featured": "is_featured",
+}
+DETAIL_FIELDS = {
+    **LIST_FIELDS,
+    "description": "event__description",
+    "event_link": "event__event_link",
+}
+CATEGORIES = {key for key, _label in Event.CATEGORY_CHOICES}
+
+
+class APIError(Exception):
+    """Invalid request parameters; rendered as a 400 response."""
+
+
+def _error(message, status=400):
+    return JsonResponse({"status": "error", "message": message}, status=status)
+
+
+def _fields(request, available):
+    """API field names selected with ``?fields=``, all by default."""
+    value = request.GET.get("fields")
+    if not value:
+        return list(available)
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise APIError(f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+
+def _date(request, name):
+    value = request.GET.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise APIError(f"{name} must be a YYYY-MM-DD date")
+
+
+def _start_of(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def encode_cursor(starts_at, event_id):
+    raw = f"{starts_at.isoformat()}|{event_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return the ``(starts_at, event_id)`` a cursor points after."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        starts_at, event_id = raw.rsplit("|", 1)
+        return datetime.datetime.fromisoformat(starts_at), int(event_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise APIError("Invalid cursor")
+
+
+def serialize(rows, fields, columns):
+    """Rename ``.values()`` rows to API field names, keeping only ``fields``."""
+    pairs = [(name, columns[name]) for name in fields]
+    return [{name: row[column] for name, column in pairs} for row in rows]
+
+
+# ----------------------------------------------------------------------
+# Conditional requests
+# ----------------------------------------------------------------------
+def _latest_change(request, event_id=None):
+    """(sequence, changed_at) of the newest relevant EventChange, memoized on the request."""
+    cache_attr = f"_api_latest_change_{event_id}"
+    if not hasattr(request, cache_attr):
+        changes = EventChange.objects.all()
+        if event_id is not None:
+            changes = changes.filter(event_id=event_id)
+        latest = changes.order_by("-sequence").values_list("sequence", "changed_at").first()
+        setattr(request, cache_attr, latest or (0, None))
+    return getattr(request, cache_attr)
+
+
+def _etag(request, *parts):
+    # Every query parameter changes the representation, and the default
+    # date window moves at midnight
+    key = "|".join([campus.current(), timezone.localdate().isoformat(), request.GET.urlencode(), *map(str, parts)])
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+def list_etag(request):
+    return _etag(request, _latest_change(request)[0])
+
+
+def list_last_modified(request):
+    changed_at = _latest_change(request)[1]
+    today = _start_of(timezone.localdate())
+    return max(changed_at, today) if changed_at else today
+
+
+def detail_etag(request, event_id):
+    return _etag(request, event_id, _latest_change(request, event_id)[0])
+
+
+def detail_last_modified(request, event_id):
+    return _latest_change(request, event_id)[1]
+
+
+# ----------------------------------------------------------------------
+# Views
+# ----------------------------------------------------------------------
+@gzip_page
+@require_GET
+@condition(etag_func=list_etag, last_modified_func=list_last_modified)
+def event_list(request):
+    """Page of approved events, filtered and trimmed to the requested fields."""
+    try:
+        fields = _fields(request, LIST_FIELDS)
+        start, end = _date(request, "from") or timezone.localdate(), _date(request, "to")
+        categories = [c for c in request.GET.get("category", "").split(",") if c]
+        if set(categories) - CATEGORIES:
+            raise APIError(f"Unknown category; choose from {', '.join(sorted(CATEGORIES))}")
+        try:
+            page_size = int(request.GET.get("limit", settings.API_PAGE_SIZE))
+        except ValueError:
+            raise APIError("limit must be a number")
+        page_size = max(1, min(page_size, settings.API_MAX_PAGE_SIZE))
+        after = decode_cursor(request.GET["cursor"]) if request.GET.get("cursor") else None
+    except APIError as exc:
+        return _error(str(exc))
+
+    items = EventFeedItem.objects.filter(starts_at__gte=_start_of(start))
+    if end is not None:
+        items = items.filter(starts_at__lt=_start_of(end + datetime.timedelta(days=1)))
+    if categories:
+        items = items.filter(category__in=categories)
+    if after is not None:
+        starts_at, event_id = after
+        items = items.filter(Q(starts_at__gt=starts_at) | Q(starts_at=starts_at, event_id__gt=event_id))
+
+    # The sort key is always fetched, even when not requested, to build the cursor
+    columns = {LIST_FIELDS[name] for name in fields} | {"starts_at", "event_id"}
+    rows = list(items.order_by("starts_at", "event_id").values(*columns)[:page_size + 1])
+
+    next_url = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        query = request.GET.copy()
+        query["cursor"] = encode_cursor(rows[-1]["starts_at"], rows[-1]["event_id"])
+        next_url = f"{request.path}?{query.urlencode()}"
+
+    return JsonResponse({"results": serialize(rows, fields, LIST_FIELDS), "next": next_url})
+
+
+@gzip_page
+@require_GET
+@condition(etag_func=detail_etag, last_modified_func=detail_last_modified)
+def event_detail(request, event_id):
+    """One approved event, including the full description and link."""
+    try:
+        fields = _fields(request, DETAIL_FIELDS)
+    except APIError as exc:
+        return _error(str(exc))
+
+    row = EventFeedItem.objects.filter(event_id=event_id).values(*{DETAIL_FIELDS[name] for name in fields}).first()
+    if row is None:
+        return _error("Event not found", status=404)
+    return JsonResponse(serialize([row], fields, DETAIL_FIELDS)[0])
+
+
+def _batch_status(event):
+    """Public status of a requested event: approved, pending, denied or removed."""
+    if event is None or event.deleted_at is not None:
+        return "removed"  # Deleted, or already moved to the archive
+    return event.status
+
+
+@gzip_page
+@require_GET
+def event_batch(request):
+    """
+    Card data for many events by id, in the order requested.
+
+    Every id gets an entry with ``id``, ``status`` and ``available``; only
+    available (approved) events carry the card fields. A pending or denied
+    event is reported as such only to its organizer or to a user who saved
+    it; anyone else sees ``removed``, as for an id that never existed, so
+    unpublished events do not leak to students.
+    """
+    if not request.user.is_authenticated:
+        return _error("Authentication required", status=401)
+
+    try:
+        fields = _fields(request, LIST_FIELDS)
+        try:
+            ids = list(dict.fromkeys(int(value) for value in request.GET.get("ids", "").split(",") if value))
+        except ValueError:
+            raise APIError("ids must be a comma-separated list of numbers")
+        if len(ids) > settings.API_BATCH_MAX_IDS:
+            raise APIError(f"At most {settings.API_BATCH_MAX_IDS} ids per request")
+    except APIError as exc:
+        return _error(str(exc))
+
+    # One query for the whole batch, soft-deleted rows included so they can be flagged
+    events = Event.all_objects.filter(id__in=ids).select_related("organizer__user").in_bulk()
+    unpublished = [
+        event for event in events.values()
+        if _batch_status(event) not in ("approved", "removed") and event.organizer.user_id != request.user.pk
+    ]
+    saved = set()
+    if unpublished:
+        saved = set(Bookmark.objects.filter(
+            user=request.user, event_id__in=[event.pk for event in unpublished]
+        ).values_list("event_id", flat=True))
+    hidden = {event.pk for event in unpublished} - saved
+
+    results = []
+    for event_id in ids:
+        event = events.get(event_id)
+        status = "removed" if event_id in hidden else _batch_status(event)
+        entry = {"id": event_id, "status": status, "available": status == "approved"}
+        if entry["available"]:
+            row = {"event_id": event.pk, **EventFeedItem.card_for(event)}
+            entry.update(serialize([row], fields, LIST_FIELDS)[0])
+        results.append(entry)
+    return JsonResponse({"results": results})
+
+
+def _version(value):
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        raise APIError("version must be a number")
+
+
+@require_http_methods(["GET", "POST"])
+def bookmark_sync(request):
+    """
+    Sync the signed-in user's bookmarks.
+
+    GET ``?version=n`` returns the current version, plus ``event_ids`` when
+    ``n`` is out of date. POST ``{"version": n, "operations": [{"op":
+    "add", "event_id": 42}, ...]}`` applies the operations first and answers
+    the same way, with ``rejected`` listing ids that could not be saved.
+    """
+    if not request.user.is_authenticated:
+        return _error("Authentication required", status=401)
+
+    try:
+        if request.method == "GET":
+            return JsonResponse(bookmarks.state(request.user, _version(request.GET.get("version"))))
+        try:
+            payload = json.loads(request.body or b"{}")
+        except ValueError:
+            raise APIError("Body must be JSON")
+        if not isinstance(payload, dict):
+            raise APIError("Body must be a JSON object")
+        adds, removes = bookmarks.parse_operations(
+            payload.get("operations", []), settings.API_BOOKMARK_SYNC_MAX_OPERATIONS
+        )
+        client_version = _version(payload.get("version"))
+    except (APIError, bookmarks.SyncError) as exc:
+        return _error(str(exc))
+
+    return JsonResponse(bookmarks.sync(request.user, adds, removes, client_version))
@@ -5,5 +5,9 @@ class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
 
-def ready(self):
-    import accounts.signals
\ No newline at end of file
+    def ready(self):
+        from . import metrics, performance, signals, slow_queries, sqlite_tuning  # noqa: F401 - registers receivers
+        sqlite_tuning.install()
+        slow_queries.install()
+        performance.install()
+        metrics.install()
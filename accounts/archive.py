@@ -0,0 +1,153 @@
+"""
+=========================================
+EVENT ARCHIVAL
+=========================================
+
+Moves dead events out of the live ``accounts_event`` table into
+``ArchivedEvent`` and back again.
+
+Archiving runs in primary-key batches, each in its own transaction: the
+rows are copied with ``bulk_create``, an ``archived`` entry is appended to
+the EventChange log for incremental consumers, and the originals are
+deleted (the post_delete receiver keeps OrganizerStats in step).
+
+Deleting a live event cascades to the students' bookmarks and view
+history of it, so those move to ``ArchivedBookmark`` and
+``ArchivedInteraction`` in the same transaction and are put back on
+restore; the affected students' bookmark lists are bumped both ways so
+their clients re-sync. Feed rows are rebuilt by the restoring save, and
+"similar events" lists by the next ``build_related_events`` run, which
+picks the restore up from the change log. Trending scores are not kept.
+"""
+
+from datetime import timedelta
+
+from django.db import router, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import history, live
+from .models import (
+    ArchivedBookmark, ArchivedEvent, ArchivedInteraction, Bookmark, BookmarkList, Event, EventChange,
+    EventInteraction,
+)
+
+
+def archivable_events(retention_days, now=None):
+    """Soft-deleted events plus events that started before the retention window."""
+    cutoff = (now or timezone.now()) - timedelta(days=retention_days)
+    return Event.objects.with_deleted().filter(
+        Q(deleted_at__isnull=False) | Q(starts_at__lt=cutoff)
+    )
+
+
+def archive_batch(events):
+    """Archive the given Event instances in one transaction; returns the count."""
+    if not events:
+        return 0
+    using = router.db_for_write(ArchivedEvent)
+    with transaction.atomic(using=using):
+        ArchivedEvent.objects.bulk_create([
+            ArchivedEvent(
+                original_id=event.pk,
+                archive_reason=ArchivedEvent.REASON_DELETED if event.deleted_at else ArchivedEvent.REASON_EXPIRED,
+                **{field: _value(event, field) for field in ArchivedEvent.COPIED_FIELDS},
+            )
+            for event in events
+        ])
+        _archive_engagement([event.pk for event in events])
+        changes = EventChange.objects.bulk_create([
+            EventChange(
+                event_id=event.pk,
+                organizer_id=event.organizer_id,
+                action=EventChange.ARCHIVED,
+                status=event.status,
+            )
+            for event in events
+        ])
+        Event.objects.with_deleted().filter(pk__in=[event.pk for event in events]).delete()
+        # bulk_create skips post_save, so publish the archive entries directly
+        transaction.on_commit(lambda: live.publish_changes(changes), using=using)
+        history.invalidate_on_commit(using)
+    return len(events)
+
+
+def archive_events(retention_days, batch_size=500, now=None):
+    """Archive every archivable event in batches; yields the size of each batch."""
+    queryset = archivable_events(retention_days, now).order_by("pk")
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return
+        last_pk = batch[-1].pk
+        yield archive_batch(batch)
+
+
+def restore_events(original_ids):
+    """Move archived events back into the live table under their original ids."""
+    restored = []
+    archived = ArchivedEvent.objects.filter(original_id__in=original_ids)
+    for row in archived:
+        with transaction.atomic(using=router.db_for_write(Event)):
+            event = Event(pk=row.original_id, **{
+                field: getattr(row, field) for field in ArchivedEvent.COPIED_FIELDS
+            })
+            # Regular save: logs a "created" change, updates OrganizerStats
+            # and rebuilds the feed row
+            event.save()
+            bookmark_count = _restore_engagement(row)
+            # auto_now/auto_now_add overwrote the audit timestamps; put them back
+            Event.objects.with_deleted().filter(pk=event.pk).update(
+                created_at=row.created_at, updated_at=row.updated_at, bookmark_count=bookmark_count
+            )
+            row.delete()
+        restored.append(row.original_id)
+    return restored
+
+
+def _bump_bookmark_lists(user_ids):
+    """Tell these users' clients their bookmark set changed."""
+    BookmarkList.objects.filter(pk__in=user_ids).update(version=F("version") + 1)
+
+
+def _archive_engagement(event_ids):
+    """Copy the bookmarks and view history of events about to be deleted."""
+    archived = dict(ArchivedEvent.objects.filter(original_id__in=event_ids).values_list("original_id", "pk"))
+    bookmarks = list(Bookmark.objects.filter(event_id__in=event_ids).values_list("event_id", "user_id", "created_at"))
+    ArchivedBookmark.objects.bulk_create([
+        ArchivedBookmark(archived_event_id=archived[event_id], user_id=user_id, created_at=created_at)
+        for event_id, user_id, created_at in bookmarks
+    ])
+    ArchivedInteraction.objects.bulk_create([
+        ArchivedInteraction(
+            archived_event_id=archived[event_id], user_id=user_id, views=views, last_viewed_at=last_viewed_at
+        )
+        for event_id, user_id, views, last_viewed_at in EventInteraction.objects.filter(
+            event_id__in=event_ids
+        ).values_list("event_id", "user_id", "views", "last_viewed_at")
+    ])
+    _bump_bookmark_lists({user_id for _event_id, user_id, _created_at in bookmarks})
+
+
+def _restore_engagement(row):
+    """Recreate the bookmarks and view history of restored ``row``; returns the bookmark count."""
+    saved_at = dict(row.bookmarks.values_list("user_id", "created_at"))
+    Bookmark.objects.bulk_create([Bookmark(user_id=user_id, event_id=row.original_id) for user_id in saved_at])
+    # auto_now_add stamped them now; put back the times students saved them
+    restored = list(Bookmark.objects.filter(event_id=row.original_id).only("pk", "user_id"))
+    for bookmark in restored:
+        bookmark.created_at = saved_at[bookmark.user_id]
+    Bookmark.objects.bulk_update(restored, ["created_at"])
+    EventInteraction.objects.bulk_create([
+        EventInteraction(user_id=user_id, event_id=row.original_id, views=views, last_viewed_at=last_viewed_at)
+        for user_id, views, last_viewed_at in row.interactions.values_list("user_id", "views", "last_viewed_at")
+    ])
+    _bump_bookmark_lists(saved_at)
+    return len(saved_at)
+
+
+def _value(event, field):
+    if field == "event_flyer":
+        return event.event_flyer.name or None
+    return getattr(event, field)
@@ -0,0 +1,125 @@
+"""
+=========================================
+SERVER-SIDE BOOKMARKS
+=========================================
+
+Saved events used to live only in the browser's localStorage. They are now
+stored as ``Bookmark`` rows so they follow the student across devices and
+can feed server-side features.
+
+Clients sync in batches: ``sync()`` takes the add/remove operations made
+since the last sync plus the ``BookmarkList.version`` the client last saw,
+applies them in one transaction and returns the canonical set when it
+differs from what the client has.
+
+Per sync, the work is a fixed number of queries however many operations
+arrive: adds go in with one ``bulk_create(ignore_conflicts=True)``, removes
+with one ``DELETE``, and ``Event.bookmark_count`` moves with one ``F()``
+update per direction, so counts are never computed on read.
+"""
+
+from django.db import router, transaction
+from django.db.models import F
+
+from . import analytics, trending
+from .models import Bookmark, BookmarkList, Event, InteractionLog
+
+ADD = "add"
+REMOVE = "remove"
+
+
+class SyncError(ValueError):
+    """Malformed sync payload."""
+
+
+def parse_operations(operations, limit):
+    """
+    Validate ``[{"op": "add"|"remove", "event_id": n}, ...]``.
+
+    Returns ``(adds, removes)`` as sets of event ids; when an event appears
+    more than once the last operation wins, as it did on the client.
+    """
+    if not isinstance(operations, list):
+        raise SyncError("operations must be a list")
+    if len(operations) > limit:
+        raise SyncError(f"At most {limit} operations per sync")
+    final = {}
+    for operation in operations:
+        try:
+            op, event_id = operation["op"], int(operation["event_id"])
+        except (TypeError, KeyError, ValueError):
+            raise SyncError("Each operation needs an op and a numeric event_id")
+        if op not in (ADD, REMOVE):
+            raise SyncError(f"Unknown op: {op}")
+        final[event_id] = op
+    adds = {event_id for event_id, op in final.items() if op == ADD}
+    return adds, set(final) - adds
+
+
+def _adjust_counts(event_ids, delta):
+    if event_ids:
+        Event.all_objects.filter(pk__in=event_ids).update(bookmark_count=F("bookmark_count") + delta)
+
+
+def sync(user, adds=(), removes=(), client_version=None):
+    """
+    Apply a batch of bookmark changes for ``user``.
+
+    Returns a dict with the new ``version``, ``changed`` (whether the client's
+    copy is out of date), ``rejected`` (ids that can't be saved because the
+    event is missing or not approved) and, when changed, the canonical
+    ``event_ids``, newest first.
+    """
+    using = router.db_for_write(Bookmark)
+    with transaction.atomic(using=using):
+        BookmarkList.objects.get_or_create(user=user)
+        # Lock the user's list so concurrent syncs can't both count one add
+        bookmark_list = BookmarkList.objects.select_for_update().get(pk=user.pk)
+
+        rejected = set()
+        added = set()
+        if adds:
+            allowed = set(Event.objects.filter(pk__in=adds, status="approved").values_list("pk", flat=True))
+            rejected = set(adds) - allowed
+            existing = set(Bookmark.objects.filter(user=user, event_id__in=allowed).values_list("event_id", flat=True))
+            added = allowed - existing
+            Bookmark.objects.bulk_create(
+                [Bookmark(user=user, event_id=event_id) for event_id in added],
+                ignore_conflicts=True,
+            )
+            _adjust_counts(added, +1)
+            trending.record(added, trending.BOOKMARK_WEIGHT)
+            analytics.log(InteractionLog.BOOKMARK, dict.fromkeys(added, 1))
+
+        removed = set()
+        if removes:
+            saved = Bookmark.objects.filter(user=user, event_id__in=removes)
+            removed = set(saved.values_list("event_id", flat=True))
+            if removed:
+                Bookmark.objects.filter(user=user, event_id__in=removed).delete()
+                _adjust_counts(removed, -1)
+
+        if added or removed:
+            BookmarkList.objects.filter(pk=user.pk).update(version=F("version") + 1)
+            bookmark_list.refresh_from_db(fields=["version"])
+
+    return {**_state(user, bookmark_list.version, client_version), "rejected": sorted(rejected)}
+
+
+def state(user, client_version=None):
+    """The user's current ``version`` and, if the client is behind, ``event_ids``."""
+    version = BookmarkList.objects.filter(pk=user.pk).values_list("version", flat=True).first() or 0
+    return _state(user, version, client_version)
+
+
+def _state(user, version, client_version):
+    result = {"version": version, "changed": client_version != version}
+    if result["changed"]:
+        result["event_ids"] = list(Bookmark.objects.filter(user=user).values_list("event_id", flat=True))
+    return result
+
+
+def release_user_bookmarks(user):
+    """Take a user's bookmarks out of the event counts, e.g. before the user is deleted."""
+    event_ids = list(Bookmark.objects.filter(user=user).values_list("event_id", flat=True))
+    _adjust_counts(event_ids, -1)
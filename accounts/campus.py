@@ -0,0 +1,184 @@
+"""
+=========================================
+MULTI-CAMPUS SHARDING
+=========================================
+
+Hosts several colleges on one deployment, each campus with its own
+database so a campus can be moved to bigger hardware on its own.
+
+- ``CAMPUSES`` in settings maps a campus slug to its database alias and the
+  host names it is served on. The ``CAMPUS_DEFAULT`` campus uses the
+  ``default`` database.
+- ``CampusMiddleware`` resolves the campus for each request, from the host
+  (``north.example.edu``) or a ``/c/<slug>/`` path prefix, and activates it
+  for the duration of the request.
+- ``CampusRouter`` sends every query to the active campus's database. Each
+  campus database holds the full schema (users, sessions, events), so
+  foreign keys never cross databases. For the default campus it defers to
+  the next router, so replica routing keeps working there.
+- ``fan_out`` runs a function against every campus in parallel with a
+  per-campus timeout, for cross-campus views such as the superuser stats
+  page; a slow campus is reported as timed out instead of holding up the
+  others.
+- Offline jobs that maintain per-campus derived tables (affinity vectors,
+  related events, trending, analytics rollups) run for every campus in
+  turn, or for one with ``--campus <slug>``.
+
+Outside a request the campus comes from the ``CAMPUS`` environment variable
+(e.g. ``CAMPUS=north manage.py archive_events``), falling back to the
+default campus; ``using_campus()`` switches it for a block of code.
+Run ``manage.py migrate --database campus_<slug>`` for each new campus.
+"""
+
+import contextlib
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+_current = contextvars.ContextVar("campus", default=None)
+
+
+def campuses():
+    return getattr(settings, "CAMPUSES", {}) or {default_campus(): {"database": DEFAULT_DB_ALIAS}}
+
+
+def default_campus():
+    return getattr(settings, "CAMPUS_DEFAULT", "main")
+
+
+def current():
+    """Slug of the active campus."""
+    return _current.get() or os.environ.get("CAMPUS") or default_campus()
+
+
+def database_for(slug):
+    try:
+        return campuses()[slug].get("database", DEFAULT_DB_ALIAS)
+    except KeyError:
+        raise LookupError(f"Unknown campus: {slug}")
+
+
+def campus_of_database(alias):
+    """Campus owning database ``alias``; aliases not in CAMPUSES (replicas) belong to the default."""
+    for slug, config in campuses().items():
+        if config.get("database", DEFAULT_DB_ALIAS) == alias:
+            return slug
+    return default_campus()
+
+
+def activate(slug):
+    """Make ``slug`` the active campus; returns a token for ``deactivate``."""
+    database_for(slug)  # Validate
+    return _current.set(slug)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextlib.contextmanager
+def using_campus(slug):
+    token = activate(slug)
+    try:
+        yield slug
+    finally:
+        deactivate(token)
+
+
+def resolve(host, path):
+    """
+    Return ``(slug, path_prefix)`` for a request.
+
+    ``path_prefix`` is ``/c/<slug>`` when the campus came from the path and
+    an empty string when it came from the host (or defaulted).
+    """
+    parts = path.split("/", 3)
+    if len(parts) > 2 and parts[1] == "c" and parts[2] in campuses():
+        return parts[2], f"/c/{parts[2]}"
+    host = host.split(":", 1)[0].lower()
+    for slug, config in campuses().items():
+        if host in config.get("hosts", ()):
+            return slug, ""
+    return default_campus(), ""
+
+
+class CampusRouter:
+    """Route every model to the active campus's database."""
+
+    def _db(self, hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        slug = current()
+        if slug == default_campus():
+            return None  # Let the next router (read replicas) decide
+        return database_for(slug)
+
+    def db_for_read(self, model, **hints):
+        return self._db(hints)
+
+    def db_for_write(self, model, **hints):
+        return self._db(hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Rows from different campuses never reference each other
+        return campus_of_database(obj1._state.db) == campus_of_database(obj2._state.db)
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None  # Every campus database carries the full schema
+
+
+# ----------------------------------------------------------------------
+# Cross-campus queries
+# ----------------------------------------------------------------------
+def selected(slug=None):
+    """Campuses an offline job runs on: just ``slug``, or every campus."""
+    if slug:
+        database_for(slug)  # Validate
+        return [slug]
+    return list(campuses())
+
+
+def _run_on_campus(func, slug):
+    started = time.perf_counter()
+    try:
+        with using_campus(slug):
+            return func(slug), (time.perf_counter() - started) * 1000
+    finally:
+        # Connections are per thread; don't leak them from pool threads
+        connections.close_all()
+
+
+def fan_out(func, timeout=None, slugs=None):
+    """
+    Call ``func(slug)`` for every campus in parallel, each with its campus active.
+
+    Returns ``{slug: {"result": ..., "error": ..., "elapsed_ms": ...}}``.
+    Campuses that don't answer within ``timeout`` seconds (default
+    CAMPUS_FAN_OUT_TIMEOUT) get ``error="timed out"``; their threads finish
+    in the background without delaying the response.
+    """
+    slugs = list(slugs or campuses())
+    timeout = timeout if timeout is not None else getattr(settings, "CAMPUS_FAN_OUT_TIMEOUT", 2.0)
+    pool = ThreadPoolExecutor(max_workers=len(slugs) or 1, thread_name_prefix="campus-fan-out")
+    futures = {slug: pool.submit(_run_on_campus, func, slug) for slug in slugs}
+    wait(futures.values(), timeout=timeout)
+    pool.shutdown(wait=False)
+
+    results = {}
+    for slug, future in futures.items():
+        entry = {"result": None, "error": None, "elapsed_ms": None}
+        if not future.done():
+            entry["error"] = "timed out"
+        elif future.exception() is not None:
+            entry["error"] = str(future.exception())
+        else:
+            result, elapsed_ms = future.result()
+            entry["result"], entry["elapsed_ms"] = result, round(elapsed_ms, 1)
+        results[slug] = entry
+    return results
@@ -0,0 +1,180 @@
+"""
+=========================================
+WRITE-BEHIND COUNTERS
+=========================================
+
+Event detail views are counted without writing to the database on the
+request path. On SQLite every ``UPDATE ... SET view_count = view_count + 1``
+would queue on the single writer lock, so busy pages would serialize
+behind their own counters.
+
+Instead ``event_views.increment(event_id)`` adds to an in-process buffer,
+aggregated per (campus, event). A background thread writes the buffer in
+one transaction per campus every COUNTER_FLUSH_INTERVAL seconds, or
+sooner once COUNTER_FLUSH_MAX_PENDING increments are waiting. The buffer
+is also flushed when the process exits. Events that received the same
+number of views share one UPDATE, and the event trending scores and the
+analytics log (``accounts.analytics``) are written in the same transaction.
+Buffers feeding the analytics log are ``daily``: each increment is kept
+under the day it happened on, so a flush just after midnight still credits
+earlier views to the previous day.
+``link_clicks`` buffers registration-link clicks for analytics the same way,
+and ``student_views`` buffers signed-in students' views per (student, event)
+for their ``EventInteraction`` rows (``accounts.recommendations``).
+
+Readers add ``pending()`` to the stored column to show exact counts for
+this process. Increments buffered in other worker processes appear once
+those workers flush, a few seconds later. A crash of the process loses at
+most one flush interval of views.
+"""
+
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import analytics, campus, recommendations, trending
+from .models import Event, InteractionLog
+
+logger = logging.getLogger(__name__)
+
+
+def _by_delta(deltas):
+    """Group ``{key: delta}`` as ``{delta: [keys]}`` so equal increments share one UPDATE."""
+    groups = defaultdict(list)
+    for key, delta in deltas.items():
+        groups[delta].append(key)
+    return groups.items()
+
+
+class CounterBuffer:
+    """
+    In-process increments, written behind by a background thread.
+
+    ``apply`` receives ``{key: delta}`` for one campus and runs inside that
+    campus's transaction, with the campus active. For a ``daily`` buffer
+    the keys are ``(key, day)``, the local date of each increment.
+    """
+
+    def __init__(self, name, apply, daily=False):
+        self.name = name
+        self._apply = apply
+        self._daily = daily
+        self._days = set()  # Days with increments not committed yet (daily buffers)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = Counter()  # (campus, key) -> delta
+        self._flushing = Counter()  # Taken out of _pending but not committed yet
+        self._total = 0
+        self._wake = threading.Event()
+        self._thread = None
+
+    def increment(self, key, amount=1):
+        """Count ``amount`` for ``key`` on the active campus; never touches the database."""
+        if self._daily:
+            day = timezone.localdate()
+            key = (key, day)
+        with self._lock:
+            if self._daily:
+                self._days.add(day)
+            self._pending[(campus.current(), key)] += amount
+            self._total += amount
+            full = self._total >= settings.COUNTER_FLUSH_MAX_PENDING
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"flush {self.name}", daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def pending(self, key):
+        """Increments for ``key`` on the active campus not yet committed."""
+        slug = campus.current()
+        with self._lock:
+            slots = [(slug, (key, day)) for day in self._days] if self._daily else [(slug, key)]
+            return sum(self._pending[slot] + self._flushing[slot] for slot in slots)
+
+    def flush(self):
+        """Write everything buffered so far; returns the number of increments written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending, self._total = self._pending, Counter(), 0
+                self._flushing = batch.copy()
+            per_campus = defaultdict(dict)
+            for (slug, key), delta in batch.items():
+                per_campus[slug][key] = delta
+
+            written = 0
+            for slug, deltas in per_campus.items():
+                try:
+                    with campus.using_campus(slug), transaction.atomic(using=campus.database_for(slug)):
+                        self._apply(deltas)
+                    written += sum(deltas.values())
+                    failed = False
+                except Exception:
+                    # Keep the increments for the next flush rather than losing them
+                    logger.exception("Flushing %s for campus %s failed", self.name, slug)
+                    failed = True
+                with self._lock:
+                    for key, delta in deltas.items():
+                        del self._flushing[(slug, key)]
+                        if failed:
+                            self._pending[(slug, key)] += delta
+                            self._total += delta
+            if self._daily:
+                with self._lock:
+                    self._days = {day for _slug, (_key, day) in self._pending}
+            return written
+
+    def _run(self):
+        while True:
+            self._wake.wait(settings.COUNTER_FLUSH_INTERVAL)
+            self._wake.clear()
+            self.flush()
+            close_old_connections()  # No request cycle here to honour CONN_MAX_AGE
+
+
+def _per_day(deltas):
+    """Split daily ``{(event_id, day): delta}`` into ``{day: {event_id: delta}}``."""
+    days = defaultdict(dict)
+    for (event_id, day), delta in deltas.items():
+        days[day][event_id] = delta
+    return days.items()
+
+
+def _apply_event_views(deltas):
+    views = Counter()
+    for (event_id, _day), delta in deltas.items():
+        views[event_id] += delta
+    for delta, event_ids in _by_delta(views):
+        Event.all_objects.filter(pk__in=event_ids).update(view_count=F("view_count") + delta)
+        trending.record(event_ids, trending.VIEW_WEIGHT * delta)
+    for day, counts in _per_day(deltas):
+        analytics.log(InteractionLog.VIEW, counts, day)
+
+
+def _apply_link_clicks(deltas):
+    for day, counts in _per_day(deltas):
+        analytics.log(InteractionLog.CLICK, counts, day)
+
+
+def _apply_student_views(deltas):
+    for delta, pairs in _by_delta(deltas):
+        recommendations.record_views(pairs, delta)
+
+
+event_views = CounterBuffer("event views", _apply_event_views, daily=True)
+link_clicks = CounterBuffer("link clicks", _apply_link_clicks, daily=True)
+student_views = CounterBuffer("student views", _apply_student_views)
+
+
+@atexit.register
+def flush_all():
+    """Flush every buffer, e.g. on shutdown."""
+    event_views.flush()
+    link_clicks.flush()
+    student_views.flush()
@@ -0,0 +1,186 @@
+"""
+=========================================
+PAST EVENTS HISTORY (COLD PATH)
+=========================================
+
+The student dashboard only reads upcoming events (the hot set). Everything
+that has already started is served from a separate, paginated history page
+that spans two stores:
+- past events still in the live table, newest first
+- approved events moved to ``ArchivedEvent`` after expiring
+
+Past events rarely change, so each rendered page is cached for
+PAST_EVENTS_CACHE_TIMEOUT seconds. Cache keys include a version number,
+bumped by ``invalidate()`` once a transaction that saves, archives or
+restores a past event (or one that was past before the save) commits,
+and the current hour, so events that have just started show up
+on the first page within the hour without any explicit invalidation.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.utils import timezone
+
+from . import campus, metrics
+from .models import ArchivedEvent, Event, UserProfile
+
+
+def _version_key():
+    return f"past-events:{campus.current()}:version"
+
+
+class PastEventsHistory:
+    """
+    Read-only sequence over live past events followed by archived ones.
+
+    Supports ``len()`` and slicing so it can be handed to ``Paginator``;
+    each slice issues at most one query per store.
+    """
+
+    def __init__(self, now=None):
+        now = now or timezone.now()
+        self.live = (
+            Event.objects.filter(status="approved").past(now)
+            .select_related("organizer__user")
+            .order_by("-starts_at", "-pk")
+        )
+        # No join here: archived rows may outlive their organizer's profile
+        self.archived = (
+            ArchivedEvent.objects.filter(status="approved", archive_reason=ArchivedEvent.REASON_EXPIRED)
+            .order_by("-starts_at", "-pk")
+        )
+        self._live_count = None
+        self._archived_count = None
+
+    def live_count(self):
+        if self._live_count is None:
+            self._live_count = self.live.count()
+        return self._live_count
+
+    def __len__(self):
+        if self._archived_count is None:
+            self._archived_count = self.archived.count()
+        return self.live_count() + self._archived_count
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        split = self.live_count()
+        items = []
+        if start < split:
+            for event in self.live[start:min(stop, split)]:
+                items.append(_item(event, event.organizer.user, event.event_flyer.url if event.event_flyer else None))
+        if stop > split:
+            rows = list(self.archived[max(start - split, 0):stop - split])
+            profiles = UserProfile.objects.select_related("user").in_bulk({row.organizer_id for row in rows})
+            for row in rows:
+                profile = profiles.get(row.organizer_id)
+                flyer = default_storage.url(row.event_flyer) if row.event_flyer else None
+                items.append(_item(row, profile.user if profile else None, flyer, archived=True))
+        return items
+
+
+def _item(event, user, flyer_url, archived=False):
+    """Plain dict for one history card, safe to pickle into the cache."""
+    return {
+        "id": None if archived else event.pk,
+        "title": event.title,
+        "date": event.date,
+        "time": event.time,
+        "location": event.location,
+        "category": event.get_category_display(),
+        "color_theme": event.color_theme,
+        "organizer": (user.first_name or user.username) if user else "",
+        "image": flyer_url or event.featured_image,
+        "archived": archived,
+    }
+
+
+def _version():
+    key = _version_key()
+    version = cache.get(key)
+    metrics.record_cache_access("past_events_version", version is not None)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+async def _aversion():
+    key = _version_key()
+    version = await cache.aget(key)
+    metrics.record_cache_access("past_events_version", version is not None)
+    if version is None:
+        await cache.aadd(key, 1, None)
+        version = await cache.aget(key, 1)
+    return version
+
+
+def invalidate():
+    """Drop every cached history page of the active campus by bumping its version number."""
+    key = _version_key()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def invalidate_on_commit(using):
+    """``invalidate()`` the campus owning database ``using`` once its current transaction commits."""
+    slug = campus.campus_of_database(using)
+
+    def run():
+        with campus.using_campus(slug):
+            invalidate()
+
+    transaction.on_commit(run, using=using)
+
+
+def _page_key(version, now, number):
+    return f"past-events:{campus.current()}:v{version}:{now:%Y%m%d%H}:page{number}"
+
+
+def _build_page(now, number):
+    paginator = Paginator(PastEventsHistory(now), getattr(settings, "PAST_EVENTS_PAGE_SIZE", 20))
+    current = paginator.get_page(number)
+    return {
+        "items": list(current.object_list),
+        "number": current.number,
+        "num_pages": paginator.num_pages,
+        "has_previous": current.has_previous(),
+        "has_next": current.has_next(),
+    }
+
+
+def get_page(number):
+    """
+    Return one page of history as a dict with ``items``, ``number``,
+    ``num_pages``, ``has_previous`` and ``has_next``.
+
+    Out-of-range page numbers fall back to the last page.
+    """
+    now = timezone.now()
+    key = _page_key(_version(), now, number)
+    page = cache.get(key)
+    metrics.record_cache_access("past_events", page is not None)
+    if page is None:
+        page = _build_page(now, number)
+        cache.set(key, page, getattr(settings, "PAST_EVENTS_CACHE_TIMEOUT", 24 * 3600))
+    return page
+
+
+async def aget_page(number):
+    """Async ``get_page``: cache hits never leave the event loop."""
+    now = timezone.now()
+    key = _page_key(await _aversion(), now, number)
+    page = await cache.aget(key)
+    metrics.record_cache_access("past_events", page is not None)
+    if page is None:
+        page = await sync_to_async(_build_page)(now, number)
+        await cache.aset(key, page, getattr(settings, "PAST_EVENTS_CACHE_TIMEOUT", 24 * 3600))
+    return page
@@ -0,0 +1,234 @@
+"""
+=========================================
+LIVE DASHBOARD UPDATES (SERVER-SENT EVENTS)
+=========================================
+
+Pushes event changes to open dashboards over one long-lived SSE connection
+per browser, replacing repeated full-page polling.
+
+Flow:
+- Every Event save appends an ``EventChange`` row. A post_save receiver
+  (``accounts.signals``) turns it into a message once the transaction
+  commits and hands it to the configured backend.
+- The backend delivers messages to the in-process ``Broker``, which fans
+  them out to subscriber queues, one per open ``/live/`` stream.
+- ``LIVE_UPDATES_BACKEND`` chooses the backend:
+  * ``InProcessBackend`` (default): direct delivery; enough when the stream
+    and the writes are served by the same single process.
+  * ``DatabaseBackend``: each process polls the EventChange log once per
+    LIVE_UPDATES_POLL_INTERVAL and feeds its own broker, so writes from any
+    worker (or a management command) reach every stream. Cost is one
+    indexed query per process per interval, independent of open streams.
+  Another transport (e.g. Redis pub/sub) only needs ``publish`` and ``start``.
+
+Message types: ``event.approved``, ``event.updated`` and ``event.removed``
+go to everyone on the campus; organizers also receive ``organizer.status``
+for every change to their own events. Message ids are EventChange sequence
+numbers, so a reconnecting browser (``Last-Event-ID``) is replayed what it
+missed from the log.
+"""
+
+import asyncio
+import json
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from . import campus
+from .models import EventChange
+
+
+PUBLIC_TYPES = ("event.approved", "event.updated", "event.removed")
+
+
+def message_for_change(change, campus_slug=None):
+    """Build the SSE message for one EventChange row."""
+    if change.action == EventChange.APPROVED:
+        kind = "event.approved"
+    elif change.action in (EventChange.DENIED, EventChange.DELETED, EventChange.ARCHIVED):
+        kind = "event.removed"
+    elif change.action == EventChange.UPDATED and change.status == "approved":
+        kind = "event.updated"
+    else:
+        kind = "organizer.status"
+    return {
+        "id": change.sequence,
+        "type": kind,
+        "event_id": change.event_id,
+        "organizer_id": change.organizer_id,
+        "action": change.action,
+        "status": change.status,
+        "campus": campus_slug or campus.current(),
+    }
+
+
+def format_sse(message):
+    """Encode a message as an SSE frame."""
+    return f"id: {message['id']}\nevent: {message['type']}\ndata: {json.dumps(message)}\n\n"
+
+
+class Subscription:
+    """One open stream: a bounded queue owned by the event loop serving it."""
+
+    def __init__(self, campus_slug, organizer_id=None, max_queue=100):
+        self.campus = campus_slug
+        self.organizer_id = organizer_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_queue)
+
+    def wants(self, message):
+        if message["campus"] != self.campus:
+            return False
+        if self.organizer_id is not None and message["organizer_id"] == self.organizer_id:
+            return True
+        return message["type"] in PUBLIC_TYPES
+
+    def offer(self, message):
+        """Queue a message, dropping the oldest one if the client is not keeping up."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+
+class Broker:
+    """In-process fan-out from published messages to subscriber queues."""
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.add(subscription)
+        get_backend().start(subscription)
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def subscriber_count(self, campus_slug=None):
+        with self._lock:
+            return sum(1 for sub in self._subscriptions if campus_slug in (None, sub.campus))
+
+    def dispatch(self, message):
+        """Deliver ``message`` to matching subscribers; safe to call from any thread."""
+        with self._lock:
+            targets = [sub for sub in self._subscriptions if sub.wants(message)]
+        for sub in targets:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, message)
+            except RuntimeError:
+                self.unsubscribe(sub)  # Its event loop has shut down
+
+
+broker = Broker()
+
+
+class InProcessBackend:
+    """Deliver messages directly to this process's broker."""
+
+    def publish(self, message):
+        broker.dispatch(message)
+
+    def start(self, subscription):
+        pass
+
+
+class DatabaseBackend:
+    """Cross-process delivery by polling the EventChange log in every process."""
+
+    def __init__(self):
+        self.interval = getattr(settings, "LIVE_UPDATES_POLL_INTERVAL", 1.0)
+        self._pollers = {}
+        self._lock = threading.Lock()
+
+    def publish(self, message):
+        pass  # The committed EventChange row is the message
+
+    def start(self, subscription):
+        """Ensure one poller per (event loop, campus) while it has subscribers."""
+        key = (subscription.loop, subscription.campus)
+        with self._lock:
+            task = self._pollers.get(key)
+            if task is None or task.done():
+                self._pollers[key] = subscription.loop.create_task(self._poll(subscription.campus))
+
+    async def _poll(self, campus_slug):
+        last = await sync_to_async(_latest_sequence)(campus_slug)
+        while broker.subscriber_count(campus_slug):
+            for message in await sync_to_async(read_changes)(campus_slug, last):
+                last = message["id"]
+                broker.dispatch(message)
+            await asyncio.sleep(self.interval)
+
+
+def _latest_sequence(campus_slug):
+    with campus.using_campus(campus_slug):
+        return EventChange.latest_sequence()
+
+
+def read_changes(campus_slug, after, limit=500):
+    """Messages for EventChange rows after sequence ``after``, oldest first."""
+    with campus.using_campus(campus_slug):
+        return [message_for_change(change, campus_slug) for change in EventChange.objects.since(after)[:limit]]
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        path = getattr(settings, "LIVE_UPDATES_BACKEND", "accounts.live.InProcessBackend")
+        _backend = import_string(path)()
+    return _backend
+
+
+def publish_changes(changes):
+    """Publish EventChange rows; call after the transaction that wrote them commits."""
+    backend = get_backend()
+    for change in changes:
+        backend.publish(message_for_change(change))
+
+
+async def stream(campus_slug, organizer_id=None, last_event_id=None):
+    """
+    Async generator of SSE frames for one client.
+
+    Replays changes after ``last_event_id``, then relays live messages,
+    sending a comment line every LIVE_UPDATES_HEARTBEAT seconds to keep
+    proxies from closing the idle connection. Ends after
+    LIVE_UPDATES_MAX_SECONDS; the browser reconnects with its last id.
+    """
+    heartbeat = getattr(settings, "LIVE_UPDATES_HEARTBEAT", 15)
+    max_seconds = getattr(settings, "LIVE_UPDATES_MAX_SECONDS", 600)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+
+    subscription = Subscription(campus_slug, organizer_id, getattr(settings, "LIVE_UPDATES_QUEUE_SIZE", 100))
+    broker.subscribe(subscription)
+    try:
+        yield f"retry: {getattr(settings, 'LIVE_UPDATES_RETRY_MS', 3000)}\n\n"
+        sent = last_event_id or 0
+        if last_event_id is not None:
+            for message in await sync_to_async(read_changes)(campus_slug, last_event_id):
+                if subscription.wants(message):
+                    sent = message["id"]
+                    yield format_sse(message)
+
+        while loop.time() < deadline:
+            try:
+                message = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=min(heartbeat, max(deadline - loop.time(), 0))
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if message["id"] <= sent:
+                continue  # Already replayed
+            sent = message["id"]
+            yield format_sse(message)
+    finally:
+        broker.unsubscribe(subscription)
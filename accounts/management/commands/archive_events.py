@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.archive import archivable_events, archive_events, restore_events
+
+
+class Command(BaseCommand):
+    help = (
+        'Move soft-deleted and long-past events into the archive table, or restore them. '
+        'Students\' bookmarks and view history move with the event; trending scores are not kept'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int,
+                            default=getattr(settings, 'EVENT_ARCHIVE_RETENTION_DAYS', 180),
+                            help='Archive events that started more than this many days ago')
+        parser.add_argument('--batch-size', type=int, default=500, help='Events moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many events would be archived')
+        parser.add_argument('--restore', nargs='+', type=int, metavar='EVENT_ID',
+                            help='Restore archived events by their original id instead of archiving')
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            restored = restore_events(options['restore'])
+            missing = sorted(set(options['restore']) - set(restored))
+            if restored:
+                self.stdout.write(self.style.SUCCESS(f'Restored {len(restored)} events: {restored}'))
+            if missing:
+                raise CommandError(f'Not found in archive: {missing}')
+            return
+
+        if options['dry_run']:
+            count = archivable_events(options['retention_days']).count()
+            self.stdout.write(f'{count} events would be archived')
+            return
+
+        total = 0
+        for moved in archive_events(options['retention_days'], options['batch_size']):
+            total += moved
+            self.stdout.write(f'Archived batch of {moved} events')
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} events'))
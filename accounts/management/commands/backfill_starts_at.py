@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from accounts.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Recompute Event.starts_at from date and time in primary-key batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows updated per batch')
+        parser.add_argument('--only-missing', action='store_true', help='Only fill rows where starts_at is NULL')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Event.objects.with_deleted().order_by('pk').only('pk', 'date', 'time', 'starts_at')
+        if options['only_missing']:
+            queryset = queryset.filter(starts_at__isnull=True)
+
+        last_pk = 0
+        updated = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            changed = []
+            for event in batch:
+                starts_at = event.compute_starts_at()
+                if starts_at != event.starts_at:
+                    event.starts_at = starts_at
+                    changed.append(event)
+            if changed:
+                Event.objects.bulk_update(changed, ['starts_at'])
+            updated += len(changed)
+            last_pk = batch[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(f'Updated starts_at on {updated} events'))
@@ -0,0 +1,147 @@
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.test import Client
+from django.urls import reverse
+
+from accounts.models import EventFeedItem
+
+
+class Command(BaseCommand):
+    help = 'Compare throughput of the read views served by the ASGI handler and by the WSGI handler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per path and handler')
+        parser.add_argument('--concurrency', type=int, default=8,
+                            help='Requests in flight: WSGI worker threads, or ASGI tasks on one event loop')
+        parser.add_argument('--username', help='Log in as this user to include the pages behind login_required')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Path to request (repeatable); defaults to event detail, plus the '
+                                 'student dashboard and past events with --username')
+        parser.add_argument('--host', default='localhost', help='Host header; must be in ALLOWED_HOSTS')
+        parser.add_argument('--modes', default='wsgi,asgi', help='Comma-separated handlers to run')
+
+    def handle(self, *args, **options):
+        session_key = self.login(options['username']) if options['username'] else None
+        paths = options['paths'] or self.default_paths(session_key)
+        cookie = f'{settings.SESSION_COOKIE_NAME}={session_key}' if session_key else ''
+        runners = {'wsgi': self.run_wsgi, 'asgi': self.run_asgi}
+
+        try:
+            for path in paths:
+                for mode in [mode.strip() for mode in options['modes'].split(',') if mode.strip()]:
+                    if mode not in runners:
+                        raise CommandError(f'Unknown mode: {mode}')
+                    elapsed, latencies, statuses = runners[mode](
+                        path, options['host'], cookie, options['requests'], options['concurrency']
+                    )
+                    self.report(mode, path, elapsed, latencies, statuses)
+        finally:
+            if session_key:
+                import_module(settings.SESSION_ENGINE).SessionStore(session_key).delete()
+
+    def login(self, username):
+        try:
+            user = get_user_model().objects.get(username=username)
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'No user named {username}')
+        client = Client()
+        client.force_login(user)
+        return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    def default_paths(self, session_key):
+        item = EventFeedItem.objects.upcoming().order_by('starts_at').first()
+        if item is None:
+            raise CommandError('No upcoming approved event to request; pass --path')
+        paths = [reverse('event_detail', args=[item.event_id])]
+        if session_key:
+            paths += [reverse('student-dashboard'), reverse('past_events')]
+        return paths
+
+    def run_wsgi(self, path, host, cookie, requests, concurrency):
+        application = get_wsgi_application()
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+            'SERVER_NAME': host, 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': host, 'HTTP_COOKIE': cookie, 'wsgi.url_scheme': 'http',
+            'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+            'wsgi.errors': io.StringIO(),
+        }
+
+        def one_request(_):
+            started = time.perf_counter()
+            status = []
+            result = application(
+                {**environ, 'wsgi.input': io.BytesIO()},
+                lambda line, headers, exc_info=None: status.append(int(line.split()[0])),
+            )
+            try:
+                for _chunk in result:
+                    pass
+            finally:
+                result.close()  # Sends request_finished, like a real server
+            return time.perf_counter() - started, status[0]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(one_request, range(requests)))
+        return time.perf_counter() - started, [o[0] for o in outcomes], [o[1] for o in outcomes]
+
+    def run_asgi(self, path, host, cookie, requests, concurrency):
+        application = get_asgi_application()
+        headers = [(b'host', host.encode())]
+        if cookie:
+            headers.append((b'cookie', cookie.encode()))
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '',
+            'query_string': b'', 'headers': headers, 'server': (host, 80), 'client': ('127.0.0.1', 0),
+        }
+
+        async def one_request(limit):
+            async with limit:
+                started = time.perf_counter()
+                status = []
+                messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+                done = asyncio.Event()
+
+                async def receive():
+                    if messages:
+                        return messages.pop()
+                    await done.wait()  # The client stays connected until the response is sent
+                    return {'type': 'http.disconnect'}
+
+                async def send(message):
+                    if message['type'] == 'http.response.start':
+                        status.append(message['status'])
+
+                await application(dict(scope), receive, send)
+                done.set()
+                return time.perf_counter() - started, status[0]
+
+        async def main():
+            limit = asyncio.Semaphore(concurrency)
+            return await asyncio.gather(*(one_request(limit) for _ in range(requests)))
+
+        started = time.perf_counter()
+        outcomes = asyncio.run(main())
+        return time.perf_counter() - started, [o[0] for o in outcomes], [o[1] for o in outcomes]
+
+    def report(self, mode, path, elapsed, latencies, statuses):
+        latencies = sorted(latencies)
+        failed = sum(1 for status in statuses if status != 200)
+        style = self.style.ERROR if failed else self.style.SUCCESS
+        self.stdout.write(style(
+            f'{mode:4} {path:28} {len(latencies) / elapsed:7.0f} req/s  '
+            f'p50 {latencies[len(latencies) // 2] * 1000:6.1f} ms  '
+            f'p95 {latencies[int(len(latencies) * 0.95)] * 1000:6.1f} ms  '
+            f'{failed} non-200'
+        ))
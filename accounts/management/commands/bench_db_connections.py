@@ -0,0 +1,108 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from accounts.models import EventFeedItem
+
+
+class Command(BaseCommand):
+    help = 'Compare simulated requests/sec with per-request connections, persistent connections and pooling'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to benchmark')
+        parser.add_argument('--requests', type=int, default=500, help='Simulated requests per worker')
+        parser.add_argument('--workers', type=int, default=4, help='Concurrent worker threads')
+        parser.add_argument('--connect-latency-ms', type=float, default=0,
+                            help='Extra delay added to every new connection, to stand in for '
+                                 'TCP + auth setup when benchmarking against a local database')
+        parser.add_argument('--modes', default='per-request,persistent,pool',
+                            help='Comma-separated modes to run (pool needs Postgres with psycopg_pool)')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        settings_dict = connections.settings[alias]
+        original = {key: settings_dict.get(key) for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+        original_options = dict(settings_dict.get('OPTIONS', {}))
+
+        opened = [0]
+        lock = threading.Lock()
+
+        def on_connect(sender, connection, **kwargs):
+            if connection.alias != alias:
+                return
+            with lock:
+                opened[0] += 1
+            if options['connect_latency_ms']:
+                time.sleep(options['connect_latency_ms'] / 1000)
+
+        connection_created.connect(on_connect, weak=False, dispatch_uid='bench_db_connections')
+        try:
+            for mode in [mode.strip() for mode in options['modes'].split(',') if mode.strip()]:
+                if mode == 'pool' and connections[alias].vendor != 'postgresql':
+                    self.stdout.write(self.style.WARNING('pool      skipped: native pooling needs PostgreSQL'))
+                    continue
+                self.configure(settings_dict, original_options, mode)
+                opened[0] = 0
+                elapsed = self.run(alias, options['workers'], options['requests'])
+                total = options['workers'] * options['requests']
+                self.stdout.write(
+                    f'{mode:10} {total / elapsed:8.0f} req/s  {elapsed:6.2f}s  {opened[0]} connections opened'
+                )
+                self.close_pool(alias)
+        finally:
+            connection_created.disconnect(dispatch_uid='bench_db_connections')
+            settings_dict.update(original)
+            settings_dict['OPTIONS'] = original_options
+
+    def configure(self, settings_dict, original_options, mode):
+        settings_dict['OPTIONS'] = {key: value for key, value in original_options.items() if key != 'pool'}
+        if mode == 'per-request':
+            settings_dict.update(CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=False)
+        elif mode == 'persistent':
+            settings_dict.update(CONN_MAX_AGE=600, CONN_HEALTH_CHECKS=True)
+        elif mode == 'pool':
+            settings_dict.update(CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=False)
+            settings_dict['OPTIONS']['pool'] = original_options.get('pool') or True
+        else:
+            raise CommandError(f'Unknown mode: {mode}')
+
+    def run(self, alias, workers, requests):
+        """Run ``requests`` request cycles per thread; returns elapsed seconds."""
+        barrier = threading.Barrier(workers + 1)
+        errors = []
+
+        def worker():
+            barrier.wait()
+            try:
+                for _ in range(requests):
+                    # The same signals a real request sends: close_old_connections
+                    # runs on both, which is where CONN_MAX_AGE takes effect
+                    request_started.send(sender=self.__class__)
+                    try:
+                        list(EventFeedItem.objects.using(alias).upcoming().order_by('starts_at')[:20])
+                    finally:
+                        request_finished.send(sender=self.__class__)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise CommandError(f'Benchmark query failed: {errors[0]}')
+        return time.perf_counter() - started
+
+    def close_pool(self, alias):
+        close_pool = getattr(connections[alias], 'close_pool', None)
+        if close_pool is not None:
+            close_pool()
@@ -0,0 +1,94 @@
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts import campus, recommendations
+from accounts.models import Bookmark, Event, EventFeedItem, EventInteraction, StudentAffinity
+
+
+class Command(BaseCommand):
+    help = 'Recompute event feature vectors and every student\'s affinity vector for personalized feed ranking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000,
+                            help='Students per matrix operation, and rows written per query')
+        parser.add_argument('--campus', choices=sorted(campus.campuses()),
+                            help='Only build vectors for this campus (default: every campus)')
+
+    def handle(self, *args, **options):
+        for slug in campus.selected(options['campus']):
+            with campus.using_campus(slug):
+                self.build(slug, options['batch_size'])
+
+    def build(self, slug, batch_size):
+        started = timezone.now()
+
+        # One feature row per live event, computed in a single pass
+        events = list(Event.all_objects.values('id', 'category', 'organizer_id', 'title', 'description'))
+        event_rows = {event['id']: row for row, event in enumerate(events)}
+        event_vectors = recommendations.event_matrix(events)
+        self.refresh_feed_vectors(slug, event_rows, event_vectors, batch_size)
+
+        # Interactions as parallel arrays: (student, event row, weight)
+        user_ids, rows, weights, ages = [], [], [], []
+        for user_id, event_id, created_at in Bookmark.objects.values_list('user_id', 'event_id', 'created_at'):
+            if event_id in event_rows:
+                user_ids.append(user_id)
+                rows.append(event_rows[event_id])
+                weights.append(recommendations.BOOKMARK_WEIGHT)
+                ages.append((started - created_at).total_seconds() / 86400)
+        for user_id, event_id, views, last_viewed_at in EventInteraction.objects.values_list(
+            'user_id', 'event_id', 'views', 'last_viewed_at'
+        ):
+            if event_id in event_rows:
+                user_ids.append(user_id)
+                rows.append(event_rows[event_id])
+                weights.append(recommendations.VIEW_WEIGHT * np.log1p(views))
+                ages.append((started - last_viewed_at).total_seconds() / 86400)
+
+        students, user_rows = np.unique(np.array(user_ids, dtype=np.int64), return_inverse=True)
+        rows = np.array(rows, dtype=np.intp)
+        weights = np.array(weights, dtype=np.float64) * recommendations.decay(np.maximum(ages, 0))
+        counts = np.bincount(user_rows, minlength=len(students))
+
+        # Students in batches: each batch is one gather and one segmented sum
+        written = 0
+        for start in range(0, len(students), batch_size):
+            stop = min(start + batch_size, len(students))
+            selected = (user_rows >= start) & (user_rows < stop)
+            vectors = recommendations.student_matrix(
+                user_rows[selected] - start, rows[selected], weights[selected], event_vectors, stop - start
+            )
+            StudentAffinity.objects.bulk_create(
+                [
+                    StudentAffinity(
+                        user_id=int(students[start + offset]),
+                        vector=recommendations.encode(vector),
+                        interactions=int(counts[start + offset]),
+                        built_at=started,
+                    )
+                    for offset, vector in enumerate(vectors)
+                ],
+                update_conflicts=True,
+                unique_fields=['user'],
+                update_fields=['vector', 'interactions', 'built_at'],
+                batch_size=batch_size,
+            )
+            written += stop - start
+
+        # Students whose interactions are all gone fall back to soonest-first
+        stale, _ = StudentAffinity.objects.filter(built_at__lt=started).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'[{slug}] Built {len(events)} event vectors and {written} student vectors '
+            f'from {len(rows)} interactions; dropped {stale} stale'
+        ))
+
+    def refresh_feed_vectors(self, slug, event_rows, event_vectors, batch_size):
+        items = []
+        for item in EventFeedItem.objects.only('event_id', 'vector'):
+            if item.event_id in event_rows:
+                item.vector = recommendations.encode(event_vectors[event_rows[item.event_id]])
+                items.append(item)
+        with transaction.atomic(using=campus.database_for(slug)):
+            EventFeedItem.objects.bulk_update(items, ['vector'], batch_size=batch_size)
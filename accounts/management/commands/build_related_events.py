@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from accounts import campus, related
+
+
+class Command(BaseCommand):
+    help = 'Update the precomputed "similar events" lists from events changed since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every list instead of only affected ones')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Events per similarity matrix product, and rows written per query')
+        parser.add_argument('--campus', choices=sorted(campus.campuses()),
+                            help='Only update this campus (default: every campus)')
+
+    def handle(self, *args, **options):
+        for slug in campus.selected(options['campus']):
+            with campus.using_campus(slug):
+                events, recomputed = related.update(full=options['full'], batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'[{slug}] Recomputed {recomputed} of {events} related-event lists'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from accounts import campus, trending
+
+
+class Command(BaseCommand):
+    help = 'Rebase trending scores to now and drop cold or orphaned EventTrend rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--campus', choices=sorted(campus.campuses()),
+                            help='Only compact this campus (default: every campus)')
+
+    def handle(self, *args, **options):
+        for slug in campus.selected(options['campus']):
+            with campus.using_campus(slug):
+                rebased, deleted = trending.compact()
+            self.stdout.write(self.style.SUCCESS(f'[{slug}] Rebased {rebased} trending scores, deleted {deleted} rows'))
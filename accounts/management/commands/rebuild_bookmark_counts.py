@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from accounts.models import Bookmark, Event
+
+
+class Command(BaseCommand):
+    help = 'Recompute Event.bookmark_count for every event from the bookmarks table'
+
+    def handle(self, *args, **options):
+        saved = (
+            Bookmark.objects.filter(event=OuterRef('pk'))
+            .order_by().values('event').annotate(total=Count('pk')).values('total')
+        )
+        # One UPDATE with a correlated subquery, soft-deleted events included
+        updated = Event.all_objects.update(bookmark_count=Coalesce(Subquery(saved), 0))
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt bookmark counts for {updated} events'))
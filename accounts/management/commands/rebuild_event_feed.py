@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from accounts.models import Event, EventFeedItem
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the EventFeedItem read model from approved, active events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows written per INSERT')
+
+    def handle(self, *args, **options):
+        events = Event.objects.filter(status='approved').select_related('organizer__user')
+        rows = [
+            EventFeedItem(event=event, **EventFeedItem.values_for(event))
+            for event in events.iterator(chunk_size=options['batch_size'])
+        ]
+
+        with transaction.atomic():
+            EventFeedItem.objects.all().delete()
+            EventFeedItem.objects.bulk_create(rows, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(rows)} feed items'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+from accounts.models import Event, OrganizerStats, UserProfile
+
+
+class Command(BaseCommand):
+    help = 'Recompute OrganizerStats counters for every organizer from the events table'
+
+    def handle(self, *args, **options):
+        counts = {
+            row['organizer_id']: row
+            for row in Event.objects.values('organizer_id').annotate(
+                total_count=Count('id'),
+                pending_count=Count('id', filter=Q(status='pending')),
+                approved_count=Count('id', filter=Q(status='approved')),
+                denied_count=Count('id', filter=Q(status='denied')),
+            )
+        }
+        empty = {'total_count': 0, 'pending_count': 0, 'approved_count': 0, 'denied_count': 0}
+
+        organizer_ids = UserProfile.objects.filter(user_type='organizer').values_list('id', flat=True)
+        rows = []
+        for organizer_id in set(organizer_ids) | set(counts):
+            values = {key: counts.get(organizer_id, empty)[key] for key in empty}
+            rows.append(OrganizerStats(organizer_id=organizer_id, **values))
+
+        with transaction.atomic():
+            OrganizerStats.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['organizer'],
+                update_fields=list(empty),
+            )
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {len(rows)} organizers'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from accounts import analytics, campus
+
+
+class Command(BaseCommand):
+    help = 'Fold new interaction log rows into the daily per-event and per-organizer analytics tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Ids per lookup and rows written per query')
+        parser.add_argument('--campus', choices=sorted(campus.campuses()),
+                            help='Only roll up this campus (default: every campus)')
+
+    def handle(self, *args, **options):
+        for slug in campus.selected(options['campus']):
+            with campus.using_campus(slug):
+                rows, event_days, organizer_days = analytics.rollup(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'[{slug}] Rolled up {rows} log rows into {event_days} event-days and {organizer_days} organizer-days'
+            ))
@@ -0,0 +1,48 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.slow_queries import rank, read_log
+
+
+class Command(BaseCommand):
+    help = 'Rank the slowest query fingerprints recorded in SLOW_QUERY_LOG_FILE'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=getattr(settings, 'SLOW_QUERY_LOG_FILE', None),
+                            help='Slow query log to read (defaults to SLOW_QUERY_LOG_FILE)')
+        parser.add_argument('--window', type=int, default=3600,
+                            help='Only consider queries from the last N seconds (0 for all)')
+        parser.add_argument('--limit', type=int, default=10, help='Number of fingerprints to show')
+        parser.add_argument('--plans', action='store_true', help='Print the captured query plan for each entry')
+
+    def handle(self, *args, **options):
+        path = options['file']
+        if not path:
+            raise CommandError('No log file given and SLOW_QUERY_LOG_FILE is not set.')
+
+        since = time.time() - options['window'] if options['window'] else None
+        events, samples = [], {}
+        try:
+            for entry in read_log(path, since=since):
+                events.append((entry['timestamp'], entry['fingerprint'], entry['duration_ms']))
+                samples[entry['fingerprint']] = entry
+        except FileNotFoundError:
+            raise CommandError(f'Slow query log not found: {path}')
+
+        ranked = rank(events, samples, options['limit'])
+        if not ranked:
+            self.stdout.write(self.style.SUCCESS('No slow queries recorded in this window'))
+            return
+
+        for position, row in enumerate(ranked, start=1):
+            self.stdout.write(self.style.WARNING(
+                f"#{position} [{row['fingerprint']}] total {row['total_ms']} ms, "
+                f"{row['count']} calls, avg {row['avg_ms']} ms, max {row['max_ms']} ms"
+            ))
+            self.stdout.write(f"    {row['sql']}")
+            self.stdout.write(f"    at {row['call_site']}")
+            if options['plans'] and row['plan']:
+                for line in row['plan']:
+                    self.stdout.write(f"      plan: {line}")
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from accounts.sqlite_tuning import checkpoint, database_stats, optimize, vacuum
+
+
+class Command(BaseCommand):
+    help = 'Checkpoint the SQLite write-ahead log and optionally VACUUM / optimize the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to maintain')
+        parser.add_argument('--mode', default='TRUNCATE', choices=['PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'],
+                            help='wal_checkpoint mode (TRUNCATE also shrinks the -wal file to zero bytes)')
+        parser.add_argument('--vacuum', action='store_true',
+                            help='Rebuild the database file to reclaim free pages (takes an exclusive lock)')
+        parser.add_argument('--optimize', action='store_true', help='Run PRAGMA optimize to refresh planner statistics')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f'Database "{options["database"]}" is {connection.vendor}, not SQLite')
+
+        before = database_stats(connection)
+        self.stdout.write(f'Before: {self.describe(before)}')
+
+        if before['journal_mode'] == 'wal':
+            busy, wal_pages, moved = checkpoint(connection, options['mode'])
+            if busy:
+                self.stdout.write(self.style.WARNING(
+                    f'Checkpoint incomplete: readers still active ({moved}/{wal_pages} WAL pages copied)'
+                ))
+            else:
+                self.stdout.write(f'Checkpointed {moved}/{wal_pages} WAL pages ({options["mode"]})')
+        else:
+            self.stdout.write(f'Journal mode is {before["journal_mode"]}; no WAL to checkpoint')
+
+        if options['vacuum']:
+            vacuum(connection)
+            self.stdout.write('VACUUM complete')
+        if options['optimize']:
+            optimize(connection)
+            self.stdout.write('PRAGMA optimize complete')
+
+        self.stdout.write(self.style.SUCCESS(f'After:  {self.describe(database_stats(connection))}'))
+
+    def describe(self, stats):
+        size_kb = stats['page_count'] * stats['page_size'] // 1024
+        return f'{size_kb} KiB, {stats["page_count"]} pages, {stats["freelist_count"]} free, journal={stats["journal_mode"]}'
@@ -0,0 +1,123 @@
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.sqlite_tuning import apply_pragmas, pragmas
+
+
+def run_worker(path, role, operations, tuned, pragma_values, timeout):
+    """
+    One writer or reader process; returns (completed, locked_errors, latencies).
+
+    Writers mimic an event save: read the organizer's current count, then
+    insert, inside one transaction. Untuned, that read-then-write upgrade is
+    exactly what raises "database is locked" under contention.
+    """
+    connection = sqlite3.connect(path, timeout=timeout if tuned else 0, isolation_level=None)
+    if tuned:
+        apply_pragmas(connection, pragma_values)
+    begin = "BEGIN IMMEDIATE" if tuned else "BEGIN"
+
+    completed, locked, latencies = 0, 0, []
+    for number in range(operations):
+        started = time.perf_counter()
+        try:
+            if role == "writer":
+                connection.execute(begin)
+                try:
+                    connection.execute("SELECT COUNT(*) FROM stress_event WHERE organizer = ?", (os.getpid(),)).fetchone()
+                    connection.execute(
+                        "INSERT INTO stress_event (organizer, title, payload) VALUES (?, ?, ?)",
+                        (os.getpid(), f"event {number}", "x" * 512),
+                    )
+                    connection.execute("COMMIT")
+                except BaseException:
+                    if connection.in_transaction:
+                        connection.execute("ROLLBACK")
+                    raise
+            else:
+                connection.execute(
+                    "SELECT id, title FROM stress_event ORDER BY id DESC LIMIT 20"
+                ).fetchall()
+            completed += 1
+        except sqlite3.OperationalError as exc:
+            if "locked" not in str(exc):
+                raise
+            locked += 1
+        latencies.append(time.perf_counter() - started)
+    connection.close()
+    return completed, locked, latencies
+
+
+class Command(BaseCommand):
+    help = 'Run parallel SQLite writers and readers to compare "database is locked" errors with and without tuning'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help='Concurrent writer processes')
+        parser.add_argument('--readers', type=int, default=4, help='Concurrent reader processes')
+        parser.add_argument('--operations', type=int, default=200, help='Operations per process')
+        parser.add_argument('--mode', default='compare', choices=['baseline', 'tuned', 'compare'],
+                            help='baseline: SQLite defaults; tuned: SQLITE_* settings; compare: both')
+
+    def handle(self, *args, **options):
+        modes = ['baseline', 'tuned'] if options['mode'] == 'compare' else [options['mode']]
+        results = {}
+        for mode in modes:
+            # A scratch database per run, so the real one is never touched
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'stress.sqlite3')
+                connection = sqlite3.connect(path)
+                connection.execute(
+                    'CREATE TABLE stress_event (id INTEGER PRIMARY KEY, organizer INTEGER, title TEXT, payload TEXT)'
+                )
+                connection.execute('CREATE INDEX stress_event_organizer ON stress_event (organizer)')
+                connection.close()
+                results[mode] = self.run(path, mode == 'tuned', options)
+            self.report(mode, results[mode])
+
+        if options['mode'] == 'compare':
+            baseline, tuned = results['baseline'], results['tuned']
+            if tuned['locked'] == 0:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Tuning removed all lock errors ({baseline["locked"]} without it)'
+                ))
+            else:
+                self.stdout.write(self.style.WARNING(
+                    f'{tuned["locked"]} lock errors remain with tuning ({baseline["locked"]} without it); '
+                    'consider raising SQLITE_BUSY_TIMEOUT_MS'
+                ))
+
+    def run(self, path, tuned, options):
+        pragma_values = pragmas()
+        timeout = getattr(settings, 'SQLITE_BUSY_TIMEOUT_MS', 5000) / 1000
+        roles = ['writer'] * options['writers'] + ['reader'] * options['readers']
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=len(roles)) as pool:
+            futures = [
+                pool.submit(run_worker, path, role, options['operations'], tuned, pragma_values, timeout)
+                for role in roles
+            ]
+            outcomes = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for _, _, worker_latencies in outcomes for latency in worker_latencies)
+        return {
+            'completed': sum(completed for completed, _, _ in outcomes),
+            'locked': sum(locked for _, locked, _ in outcomes),
+            'elapsed': elapsed,
+            'p50_ms': latencies[len(latencies) // 2] * 1000 if latencies else 0,
+            'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0,
+        }
+
+    def report(self, mode, result):
+        style = self.style.ERROR if result['locked'] else self.style.SUCCESS
+        self.stdout.write(style(
+            f'{mode:8}  {result["completed"]} ok, {result["locked"]} locked, '
+            f'{result["completed"] / result["elapsed"]:.0f} ops/s, '
+            f'p50 {result["p50_ms"]:.1f} ms, p99 {result["p99_ms"]:.1f} ms'
+        ))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.routers import replicas, sync_sqlite_replica
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database into the replica databases (local stand-in for replication)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('aliases', nargs='*', help='Replica aliases to sync (defaults to DATABASE_REPLICAS)')
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Keep syncing every N seconds, simulating replication lag (0 syncs once)')
+
+    def handle(self, *args, **options):
+        aliases = options['aliases'] or replicas()
+        if not aliases:
+            raise CommandError('No replicas configured; set DATABASE_REPLICA_NAME')
+
+        while True:
+            for alias in aliases:
+                try:
+                    pages = sync_sqlite_replica(alias)
+                except ValueError as exc:
+                    raise CommandError(str(exc))
+                self.stdout.write(f'Synced {alias}: {pages} pages')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS('Replicas up to date'))
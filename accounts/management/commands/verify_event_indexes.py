@@ -0,0 +1,157 @@
+import datetime
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+from accounts import trending
+from accounts.models import Event, EventFeedItem, EventTrend
+
+
+def hot_queries():
+    """
+    The Event access paths that must stay indexed.
+
+    Each entry is (description, queryset, expected index name). Querysets are
+    never evaluated here; only their EXPLAIN output is inspected.
+    """
+    feed = Event.objects.filter(status='approved')
+    now = timezone.now()
+    return [
+        (
+            'Student feed (approved, not deleted, newest first)',
+            feed.order_by('-starts_at'),
+            'event_feed_idx',
+        ),
+        (
+            'Student feed, upcoming only',
+            feed.upcoming(now).order_by('starts_at'),
+            'event_feed_idx',
+        ),
+        (
+            'Student feed, next 7 days',
+            feed.starting_within(7, now).order_by('starts_at'),
+            'event_feed_idx',
+        ),
+        (
+            'Student feed read model, upcoming only',
+            EventFeedItem.objects.upcoming(now).order_by('starts_at'),
+            'event_feed_item_start_idx',
+        ),
+        (
+            'Student feed read model, next 7 days',
+            EventFeedItem.objects.starting_within(7, now).order_by('starts_at'),
+            'event_feed_item_start_idx',
+        ),
+        (
+            'Trending top-N',
+            EventTrend.objects.filter(rank_key__gte=0).order_by('-rank_key'),
+            'event_trend_rank_idx',
+        ),
+        (
+            'Organizer dashboard (own active events, newest first)',
+            Event.objects.filter(organizer_id=1).order_by('-starts_at'),
+            'event_organizer_idx',
+        ),
+        (
+            'Organizer status count',
+            Event.objects.filter(organizer_id=1, status='pending'),
+            'event_organizer_idx',
+        ),
+        (
+            'Admin moderation counts',
+            Event.objects.with_deleted().filter(status='pending'),
+            'event_status_category_idx',
+        ),
+        (
+            'Admin status + category filter',
+            Event.objects.with_deleted().filter(status='pending', category='hackathon').order_by('-starts_at'),
+            'event_status_category_idx',
+        ),
+        (
+            'Admin category filter',
+            Event.objects.with_deleted().filter(category='hackathon').order_by('-starts_at'),
+            'event_category_start_idx',
+        ),
+        (
+            'Admin featured filter',
+            Event.objects.with_deleted().filter(is_featured=True).order_by('-starts_at'),
+            'event_featured_start_idx',
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN each hot Event query and fail if it does not use its expected index; '
+        'also check that the trending score updates run on this database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full plan for every query')
+
+    def handle(self, *args, **options):
+        failures = []
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Tiny development tables always favour a sequential scan;
+                # we want to know whether an index *can* serve the query
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for description, queryset, index_name in hot_queries():
+                plan = queryset.explain()
+                problem = self.check_plan(plan, index_name)
+                if problem:
+                    failures.append(description)
+                    self.stdout.write(self.style.ERROR(f'FAIL  {description}: {problem}'))
+                    self.stdout.write(self.indent(plan))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'OK    {description} -> {index_name}'))
+                    if options['verbose_plans']:
+                        self.stdout.write(self.indent(plan))
+
+            problem = self.check_trending()
+            if problem:
+                failures.append('Trending score updates')
+                self.stdout.write(self.style.ERROR(f'FAIL  Trending score updates: {problem}'))
+            else:
+                self.stdout.write(self.style.SUCCESS('OK    Trending score updates'))
+
+        if failures:
+            raise CommandError(f'{len(failures)} hot queries are not using their index: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('All hot Event queries use their indexes'))
+
+    def check_trending(self):
+        """
+        Run the trending UPDATEs on a scratch row, then roll them back.
+
+        PostgreSQL raises on exp() underflow where SQLite returns 0, so a
+        first interaction, a bump of a long-cold row and a rebase are run
+        here for real. Returns a description of the failure, or None.
+        """
+        savepoint = transaction.savepoint()
+        try:
+            # EventTrend has no foreign key constraint, so no event is needed
+            trending.record([-1], trending.VIEW_WEIGHT)
+            year_ago = timezone.now() - datetime.timedelta(days=365)
+            EventTrend.objects.filter(event_id=-1).update(rank_key=trending._clock(year_ago))
+            trending.record([-1], trending.VIEW_WEIGHT)
+            EventTrend.objects.filter(event_id=-1).update(rank_key=trending._clock(year_ago))
+            EventTrend.objects.filter(event_id=-1).update(score=trending._decayed(trending._clock(timezone.now())))
+        except DatabaseError as exc:
+            return str(exc)
+        finally:
+            transaction.savepoint_rollback(savepoint)
+        return None
+
+    def check_plan(self, plan, index_name):
+        """Return a description of what is wrong with ``plan``, or None."""
+        if not re.search(rf'\b{re.escape(index_name)}\b', plan):
+            return f'expected index {index_name} is not used'
+        if 'TEMP B-TREE FOR ORDER BY' in plan:
+            return 'index used, but rows are sorted in a temporary B-tree'
+        return None
+
+    def indent(self, plan):
+        return '\n'.join(f'      {line}' for line in plan.splitlines())
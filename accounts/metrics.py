@@ -0,0 +1,317 @@
+"""
+=========================================
+PROMETHEUS-STYLE APPLICATION METRICS
+=========================================
+
+In-process metric registry rendered in the Prometheus text exposition
+format by the ``/metrics`` endpoint.
+
+Design:
+- Each metric keeps a plain dict of label-tuple -> value guarded by its own
+  lock, held only for the duration of a single dict update.
+- With ``METRICS_MULTIPROC_DIR`` set, every worker process periodically
+  writes a JSON snapshot of its values to ``metrics-<pid>.json`` in that
+  directory (atomic rename). A scrape merges all snapshots, so the numbers
+  are correct no matter which worker answers the request.
+- ``render_latest()`` returns the exposition text and needs no Prometheus
+  server, which keeps the output easy to check from a shell or a test.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    """Base class holding values keyed by a tuple of label values."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def snapshot(self):
+        """Copy of the current values with JSON-friendly keys."""
+        with self._lock:
+            return {"|".join(key): value for key, value in self._values.items()}
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Gauge whose per-process values are summed across workers."""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Cumulative histogram; each value is ``[bucket counts..., count, sum]``."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[index] += 1
+            row[-2] += 1
+            row[-1] += value
+
+
+class Registry:
+    """Collection of metrics plus the multi-process snapshot logic."""
+
+    def __init__(self):
+        self.metrics = {}
+        self._last_flush = 0.0
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    # ------------------------------------------------------------------
+    # Multi-process support
+    # ------------------------------------------------------------------
+    def _directory(self):
+        return getattr(settings, "METRICS_MULTIPROC_DIR", None)
+
+    def maybe_flush(self):
+        """Write this process's snapshot if the flush interval has passed."""
+        interval = getattr(settings, "METRICS_FLUSH_INTERVAL", 5.0)
+        if self._directory() and time.monotonic() - self._last_flush >= interval:
+            self.flush()
+
+    def flush(self):
+        """Atomically write this process's values to the shared directory."""
+        directory = self._directory()
+        if not directory:
+            return
+        os.makedirs(directory, exist_ok=True)
+        data = {name: metric.snapshot() for name, metric in self.metrics.items()}
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        with os.fdopen(fd, "w") as handle:
+            json.dump(data, handle)
+        os.replace(tmp_path, os.path.join(directory, f"metrics-{os.getpid()}.json"))
+        self._last_flush = time.monotonic()
+
+    def collect(self):
+        """Return merged values for every metric across all processes."""
+        directory = self._directory()
+        if not directory:
+            return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+        self.flush()
+        merged = {name: {} for name in self.metrics}
+        for filename in os.listdir(directory):
+            if not (filename.startswith("metrics-") and filename.endswith(".json")):
+                continue
+            alive = _pid_alive(filename[len("metrics-"):-len(".json")])
+            try:
+                with open(os.path.join(directory, filename)) as handle:
+                    data = json.load(handle)
+            except (OSError, ValueError):
+                continue  # File being replaced or truncated; skip this round
+            for name, values in data.items():
+                if name not in merged:
+                    continue
+                if self.metrics[name].kind == "gauge" and not alive:
+                    continue  # Gauges describe live state; ignore exited workers
+                target = merged[name]
+                for key, value in values.items():
+                    if isinstance(value, list):
+                        current = target.setdefault(key, [0] * len(value))
+                        target[key] = [a + b for a, b in zip(current, value)]
+                    else:
+                        target[key] = target.get(key, 0) + value
+        return merged
+
+    # ------------------------------------------------------------------
+    # Exposition
+    # ------------------------------------------------------------------
+    def render(self):
+        lines = []
+        collected = self.collect()
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for key, value in sorted(collected[name].items()):
+                label_values = key.split("|") if metric.labelnames else []
+                pairs = list(zip(metric.labelnames, label_values))
+                if metric.kind == "histogram":
+                    for bound, count in zip(metric.buckets, value):
+                        lines.append(f"{name}_bucket{_labels(pairs + [('le', _number(bound))])} {count}")
+                    lines.append(f"{name}_bucket{_labels(pairs + [('le', '+Inf')])} {value[-2]}")
+                    lines.append(f"{name}_count{_labels(pairs)} {value[-2]}")
+                    lines.append(f"{name}_sum{_labels(pairs)} {_number(value[-1])}")
+                else:
+                    lines.append(f"{name}{_labels(pairs)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# ----------------------------------------------------------------------
+# Application metrics
+# ----------------------------------------------------------------------
+registry = Registry()
+
+request_latency = registry.register(Histogram(
+    "studentconnect_request_duration_seconds",
+    "Request latency per view.",
+    ["view"],
+))
+requests_total = registry.register(Counter(
+    "studentconnect_requests_total",
+    "Requests served, by view and HTTP status.",
+    ["view", "status"],
+))
+db_queries_total = registry.register(Counter(
+    "studentconnect_db_queries_total",
+    "Database queries executed, by view.",
+    ["view"],
+))
+cache_requests_total = registry.register(Counter(
+    "studentconnect_cache_requests_total",
+    "Application cache lookups, by cache name and result (hit/miss).",
+    ["cache", "result"],
+))
+session_writes_total = registry.register(Counter(
+    "studentconnect_session_writes_total",
+    "Responses that caused the session to be saved.",
+))
+upstream_api_calls_total = registry.register(Counter(
+    "studentconnect_upstream_api_calls_total",
+    "Calls to external APIs made through APIHandler, by api and outcome.",
+    ["api", "outcome"],
+))
+
+
+def render_latest():
+    """Prometheus text exposition of all application metrics."""
+    return registry.render()
+
+
+def record_cache_access(cache_name, hit):
+    """
+    Count a lookup in the shared cache.
+
+    The past events history (``accounts.history``) is currently the only
+    reader, under ``past_events`` (pages) and ``past_events_version``.
+    """
+    cache_requests_total.inc(cache=cache_name, result="hit" if hit else "miss")
+
+
+def count_api_call(api_name):
+    """
+    Decorator counting calls to an upstream API.
+
+    APIHandler methods return None on failure, which is counted as an error.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            outcome = "error" if result is None else "ok"
+            upstream_api_calls_total.inc(api=api_name, outcome=outcome)
+            return result
+        return wrapper
+    return decorator
+
+
+# Query count of the request being served, see ``MetricsMiddleware``
+_query_count = contextvars.ContextVar("db_query_count", default=None)
+
+
+def start_query_count():
+    """Count queries for the current request; returns (counter, token)."""
+    counter = [0]
+    return counter, _query_count.set(counter)
+
+
+def finish_query_count(token):
+    _query_count.reset(token)
+
+
+def query_counter(execute, sql, params, many, context):
+    """Execute wrapper adding one to the current request's query count."""
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+def _install_query_counter(sender, connection, **kwargs):
+    if query_counter not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_counter)
+
+
+def install():
+    """Attach ``query_counter`` to every database connection as it is opened."""
+    connection_created.connect(_install_query_counter, dispatch_uid="metrics_query_counter")
@@ -1,8 +1,41 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.http import HttpResponse
+from django.conf import settings
+from django.urls import get_script_prefix, set_script_prefix
+import cProfile
+import json
+import logging
+import random
+import threading
 import time
 
+from accounts import campus, metrics, performance, profiling, routers
+
+performance_logger = logging.getLogger('studentconnect.performance')
+logger = logging.getLogger(__name__)
+
+
+class HybridMiddleware:
+    """
+    Base for middleware usable in both the WSGI and the ASGI handler chain.
+
+    Django only keeps a request async end to end when every middleware is
+    async capable; a single sync-only one makes each async view hop to a
+    thread and back. Subclasses implement ``__call__`` for the sync chain
+    and ``__acall__`` for the async one.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+
 class LogoutProtectionMiddleware:
     """
     Middleware to prevent accidental logout via browser navigation.
@@ -43,4 +76,322 @@ class LogoutProtectionMiddleware:
                 except UserProfile.DoesNotExist:
                     return redirect('organizer-dashboard')
         
-        return redirect('landing')
\ No newline at end of file
+        return redirect('landing')
+
+
+class ServerTimingMiddleware(HybridMiddleware):
+    """
+    Per-request performance instrumentation.
+
+    For a sampled fraction of requests this measures total time, ORM time and
+    query count, template render time and time spent in ``APIHandler`` calls.
+    The results are sent back in a ``Server-Timing`` header (visible in the
+    browser dev tools) and written as one JSON log line per request.
+
+    Settings:
+    - PERF_TIMING_ENABLED: master switch (default True)
+    - PERF_TIMING_SAMPLE_RATE: fraction of requests to instrument, 0.0-1.0
+      (default 1.0 with DEBUG, 0.01 otherwise)
+    - PERF_TIMING_HEADER: whether to emit the Server-Timing header (default DEBUG)
+    """
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.enabled = getattr(settings, 'PERF_TIMING_ENABLED', True)
+        self.sample_rate = getattr(settings, 'PERF_TIMING_SAMPLE_RATE', 1.0 if settings.DEBUG else 0.01)
+        self.emit_header = getattr(settings, 'PERF_TIMING_HEADER', settings.DEBUG)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timings, token = performance.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            performance.finish_request(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        if not self.enabled or random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        timings, token = performance.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            performance.finish_request(token)
+        return self.finish(request, response, timings)
+
+    def finish(self, request, response, timings):
+        if self.emit_header:
+            response['Server-Timing'] = timings.as_header()
+
+        match = getattr(request, 'resolver_match', None)
+        performance_logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            **timings.as_log_fields(),
+        }))
+        return response
+
+
+class MetricsMiddleware(HybridMiddleware):
+    """
+    Feeds the Prometheus-style registry in ``accounts.metrics``.
+
+    Records per-view latency, request counts by status, query counts and
+    session writes for every request. Counting is a handful of dict updates,
+    so unlike ``ServerTimingMiddleware`` it is not sampled.
+    """
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.save_every_request = getattr(settings, 'SESSION_SAVE_EVERY_REQUEST', False)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        query_count, token = metrics.start_query_count()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.finish_query_count(token)
+        return self.record(request, response, time.perf_counter() - started, query_count[0])
+
+    async def __acall__(self, request):
+        query_count, token = metrics.start_query_count()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.finish_query_count(token)
+        return self.record(request, response, time.perf_counter() - started, query_count[0])
+
+    def record(self, request, response, elapsed, query_count):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        metrics.request_latency.observe(elapsed, view=view)
+        metrics.requests_total.inc(view=view, status=response.status_code)
+        metrics.db_queries_total.inc(query_count, view=view)
+        if self._session_saved(request, response):
+            metrics.session_writes_total.inc()
+        metrics.registry.maybe_flush()
+        return response
+
+    def _session_saved(self, request, response):
+        """Mirror SessionMiddleware's decision to save the session."""
+        session = getattr(request, 'session', None)
+        if session is None or response.status_code >= 500:
+            return False
+        try:
+            accessed, modified, empty = session.accessed, session.modified, session.is_empty()
+        except AttributeError:
+            return False
+        return accessed and (modified or self.save_every_request) and not empty
+
+
+class ProfilingMiddleware(HybridMiddleware):
+    """
+    Capture profiles for a fraction of requests, or for slow requests.
+
+    Settings:
+    - PROFILING_ENABLED: master switch (default False)
+    - PROFILING_SAMPLE_RATE: fraction of requests profiled with cProfile
+    - PROFILING_VIEW_RATES: per view-name overrides, e.g. {'student-dashboard': 0.1}
+    - PROFILING_THRESHOLD_MS: keep stack samples of requests slower than this
+      (0 disables threshold capture)
+
+    Both profilers follow a single thread, so requests served by the ASGI
+    handler are not profiled: there the view runs on the event loop (or a
+    worker thread) while this middleware runs elsewhere. Under WSGI an async
+    view runs on the event loop thread of ``async_to_sync``; it is only
+    profiled when wrapped in ``profiling.profile_async_view``, which covers
+    that thread while this middleware covers the request thread. Other async
+    views are skipped and logged as not profiled.
+    """
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.enabled = getattr(settings, 'PROFILING_ENABLED', False)
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+        self.view_rates = getattr(settings, 'PROFILING_VIEW_RATES', {})
+        self.threshold_ms = getattr(settings, 'PROFILING_THRESHOLD_MS', 0)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        view_name = getattr(request, '_profiling_view', None)
+        profiler = getattr(request, '_profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            view_profiler = getattr(request, '_view_profiler', None)
+            others = [view_profiler] if view_profiler is not None else []
+            profiling.save_cprofile(profiler, view_name, elapsed_ms, *others)
+        elif getattr(request, '_profiling_sampled_stacks', False):
+            samples = profiling.get_sampler().stop_watching(threading.get_ident())
+            samples.update(getattr(request, '_view_samples', {}))
+            if elapsed_ms >= self.threshold_ms and samples:
+                profiling.save_stack_samples(samples, view_name, elapsed_ms)
+        return response
+
+    async def __acall__(self, request):
+        # process_view runs on a worker thread here, so a profile started
+        # there could not be stopped from the event loop
+        request._profiling_skip = True
+        return await self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.enabled or getattr(request, '_profiling_skip', False):
+            return None
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        request._profiling_view = view_name
+
+        async_view = iscoroutinefunction(view_func)
+        if async_view and not getattr(view_func, 'profiles_own_thread', False):
+            # Its coroutine runs on another thread, so a profile taken here
+            # would be nearly empty and misleading
+            logger.info("Not profiled: %s is an async view without profiling.profile_async_view", view_name)
+            return None
+
+        rate = self.view_rates.get(view_name, self.sample_rate)
+        if rate and random.random() < rate:
+            request._profiler = cProfile.Profile()
+            try:
+                request._profiler.enable()
+            except ValueError:
+                # Another profiler is already active on this thread
+                request._profiler = None
+            else:
+                if async_view:
+                    request._profiling_mode = 'cprofile'
+        elif self.threshold_ms:
+            profiling.get_sampler().start_watching(threading.get_ident())
+            request._profiling_sampled_stacks = True
+            if async_view:
+                request._profiling_mode = 'stacks'
+        return None
+
+
+class ReplicaRoutingMiddleware(HybridMiddleware):
+    """
+    Opt read-heavy views into replica reads, with read-your-writes stickiness.
+
+    Settings:
+    - DATABASE_REPLICAS: replica aliases; the middleware is inert without them
+    - DATABASE_REPLICA_VIEWS: view names whose GET/HEAD requests may read
+      from a replica
+    - DATABASE_REPLICA_STICKY_SECONDS: after a request writes a replicated
+      model, that browser reads from the primary for this long
+    - DATABASE_REPLICA_STICKY_COOKIE: name of the cookie carrying the deadline
+    """
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.enabled = bool(getattr(settings, 'DATABASE_REPLICAS', []))
+        self.views = set(getattr(settings, 'DATABASE_REPLICA_VIEWS', ()))
+        self.sticky_seconds = getattr(settings, 'DATABASE_REPLICA_STICKY_SECONDS', 10)
+        self.cookie_name = getattr(settings, 'DATABASE_REPLICA_STICKY_COOKIE', 'db_primary_until')
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        state, token = routers.start_request()
+        request._db_routing = state
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.finish_request(token)
+        return self.finish(state, response)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        state, token = routers.start_request()
+        request._db_routing = state
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers.finish_request(token)
+        return self.finish(state, response)
+
+    def finish(self, state, response):
+        if state.wrote:
+            response.set_cookie(
+                self.cookie_name,
+                str(int(time.time() + self.sticky_seconds)),
+                max_age=self.sticky_seconds,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = getattr(request, '_db_routing', None)
+        if state is None or request.method not in ('GET', 'HEAD'):
+            return None
+        match = request.resolver_match
+        if match and match.view_name in self.views and not self._sticky(request):
+            state.use_replica = True
+        return None
+
+    def _sticky(self, request):
+        try:
+            return float(request.COOKIES.get(self.cookie_name, 0)) > time.time()
+        except ValueError:
+            return False
+
+
+class CampusMiddleware(HybridMiddleware):
+    """
+    Activate the request's campus (see ``accounts.campus``).
+
+    The campus comes from a ``/c/<slug>/`` path prefix or the host name.
+    A path prefix is stripped before URL resolution and installed as the
+    script prefix, so ``reverse()`` and ``{% url %}`` keep links inside the
+    campus. Must run before anything that touches the database.
+    """
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token, previous_prefix = self.enter(request)
+        try:
+            return self.get_response(request)
+        finally:
+            self.exit(token, previous_prefix)
+
+    async def __acall__(self, request):
+        token, previous_prefix = self.enter(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            self.exit(token, previous_prefix)
+
+    def enter(self, request):
+        slug, prefix = campus.resolve(request.get_host(), request.path_info)
+        request.campus = slug
+        token = campus.activate(slug)
+        previous_prefix = None
+        if prefix:
+            request.path_info = request.path_info[len(prefix):] or '/'
+            previous_prefix = get_script_prefix()
+            set_script_prefix(previous_prefix.rstrip('/') + prefix + '/')
+        return token, previous_prefix
+
+    def exit(self, token, previous_prefix):
+        campus.deactivate(token)
+        if previous_prefix is not None:
+            set_script_prefix(previous_prefix)
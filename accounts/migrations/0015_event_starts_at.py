@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+BATCH_SIZE = 500
+
+
+def backfill_starts_at(apps, schema_editor):
+    """Populate starts_at for existing events in primary-key batches."""
+    Event = apps.get_model('accounts', 'Event')
+    tz = timezone.get_default_timezone()
+    last_pk = 0
+    while True:
+        batch = list(
+            Event.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', 'date', 'time')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for event in batch:
+            event.starts_at = timezone.make_aware(datetime.combine(event.date, event.time), tz)
+        Event.objects.bulk_update(batch, ['starts_at'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_event_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='starts_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, help_text='Timezone-aware start (date + time), maintained on save for ordering and range queries', null=True),
+        ),
+        migrations.RunPython(backfill_starts_at, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_feed_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_organizer_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_status_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_category_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_featured_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['status', '-starts_at'], name='event_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['organizer', '-starts_at'], name='event_organizer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'category', '-starts_at'], name='event_status_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['category', '-starts_at'], name='event_category_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['-starts_at'], name='event_featured_start_idx'),
+        ),
+    ]
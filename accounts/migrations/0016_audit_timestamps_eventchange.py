@@ -0,0 +1,52 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0015_event_starts_at'),
+    ]
+
+    operations = [
+        # Existing rows have no recorded history; they get the migration time
+        migrations.AddField(
+            model_name='event',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, help_text='When the event was submitted'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, help_text='When the event was last changed'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, help_text='When the profile was created'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='When the profile was last changed'),
+        ),
+        migrations.CreateModel(
+            name='EventChange',
+            fields=[
+                ('sequence', models.BigAutoField(primary_key=True, serialize=False)),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('approved', 'Approved'), ('denied', 'Denied'), ('deleted', 'Deleted')], max_length=20)),
+                ('status', models.CharField(help_text='Event status after the change', max_length=20)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(blank=True, help_text='User who made the change, when known', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('event', models.ForeignKey(db_constraint=False, help_text='The event that changed', on_delete=django.db.models.deletion.DO_NOTHING, related_name='changes', to='accounts.event')),
+                ('organizer', models.ForeignKey(db_constraint=False, help_text='Organizer of the event at the time of the change', on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='accounts.userprofile')),
+            ],
+            options={
+                'ordering': ['sequence'],
+            },
+        ),
+    ]
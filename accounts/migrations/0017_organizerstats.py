@@ -0,0 +1,40 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_stats(apps, schema_editor):
+    """Seed counters for organizers that already have events."""
+    Event = apps.get_model('accounts', 'Event')
+    OrganizerStats = apps.get_model('accounts', 'OrganizerStats')
+    rows = Event.objects.filter(deleted_at__isnull=True).values('organizer_id').annotate(
+        total_count=models.Count('id'),
+        pending_count=models.Count('id', filter=models.Q(status='pending')),
+        approved_count=models.Count('id', filter=models.Q(status='approved')),
+        denied_count=models.Count('id', filter=models.Q(status='denied')),
+    )
+    OrganizerStats.objects.bulk_create([OrganizerStats(**row) for row in rows])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0016_audit_timestamps_eventchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizerStats',
+            fields=[
+                ('organizer', models.OneToOneField(help_text='Organizer profile these counters belong to', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='accounts.userprofile')),
+                ('total_count', models.IntegerField(default=0)),
+                ('pending_count', models.IntegerField(default=0)),
+                ('approved_count', models.IntegerField(default=0)),
+                ('denied_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'organizer stats',
+            },
+        ),
+        migrations.RunPython(build_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.5 on 2026-10-19 02:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0017_organizerstats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='eventchange',
+            name='action',
+            field=models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('approved', 'Approved'), ('denied', 'Denied'), ('deleted', 'Deleted'), ('archived', 'Archived')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ArchivedEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(help_text='Primary key the event had in the live table', unique=True)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('category', models.CharField(choices=[('hackathon', 'Hackathon'), ('workshop', 'Workshop'), ('internship', 'Internship'), ('techevent', 'Tech Event')], max_length=20)),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('starts_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('location', models.CharField(max_length=255)),
+                ('event_flyer', models.CharField(blank=True, help_text='Stored file name of the flyer', max_length=100, null=True)),
+                ('event_link', models.URLField()),
+                ('additional_details', models.TextField(blank=True, null=True)),
+                ('contact_email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('requirements', models.TextField(blank=True, null=True)),
+                ('prizes', models.TextField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('denied', 'Denied')], max_length=20)),
+                ('denial_reason', models.TextField(blank=True, null=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('featured_image', models.URLField(blank=True, null=True)),
+                ('color_theme', models.CharField(blank=True, max_length=20, null=True)),
+                ('styling_applied', models.BooleanField(default=False)),
+                ('is_featured', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('archive_reason', models.CharField(choices=[('deleted', 'Soft-deleted'), ('expired', 'Past retention window')], max_length=20)),
+                ('deleted_by', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('organizer', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='archived_events', to='accounts.userprofile')),
+            ],
+            options={
+                'ordering': ['-starts_at'],
+            },
+        ),
+    ]
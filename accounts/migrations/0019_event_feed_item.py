@@ -0,0 +1,68 @@
+# Generated by Django 5.2.5 on 2026-10-19 02:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def build_feed(apps, schema_editor):
+    """Project every approved, active event into the feed table."""
+    Event = apps.get_model('accounts', 'Event')
+    EventFeedItem = apps.get_model('accounts', 'EventFeedItem')
+    events = Event.objects.filter(status='approved', deleted_at__isnull=True).select_related('organizer__user')
+    rows = []
+    for event in events.iterator(chunk_size=500):
+        user = event.organizer.user
+        rows.append(EventFeedItem(
+            event_id=event.pk,
+            organizer_user_id=user.pk,
+            title=event.title,
+            category=event.category,
+            category_label=event.get_category_display(),
+            date=event.date,
+            time=event.time,
+            starts_at=event.starts_at,
+            location=event.location,
+            organizer_name=user.first_name or user.username,
+            summary=Truncator(event.description or '').words(20),
+            image_url=event.event_flyer.url if event.event_flyer else (event.featured_image or ''),
+            color_theme=event.color_theme or '',
+            is_featured=event.is_featured,
+        ))
+    EventFeedItem.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0018_archivedevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventFeedItem',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_item', serialize=False, to='accounts.event')),
+                ('title', models.CharField(max_length=255)),
+                ('category', models.CharField(max_length=20)),
+                ('category_label', models.CharField(max_length=50)),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('starts_at', models.DateTimeField(blank=True, null=True)),
+                ('location', models.CharField(max_length=255)),
+                ('organizer_name', models.CharField(max_length=150)),
+                ('summary', models.TextField(blank=True)),
+                ('image_url', models.CharField(blank=True, max_length=500)),
+                ('color_theme', models.CharField(blank=True, max_length=20)),
+                ('is_featured', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organizer_user', models.ForeignKey(help_text='Used to refresh organizer_name when the user is renamed', on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['starts_at'],
+                'indexes': [models.Index(fields=['starts_at'], name='event_feed_item_start_idx')],
+            },
+        ),
+        migrations.RunPython(build_feed, migrations.RunPython.noop),
+    ]
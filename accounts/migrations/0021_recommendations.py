@@ -0,0 +1,45 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0020_bookmarks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventfeeditem',
+            name='vector',
+            field=models.BinaryField(blank=True, default=b'', help_text='Feature vector used to rank the feed per student'),
+        ),
+        migrations.CreateModel(
+            name='EventInteraction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('last_viewed_at', models.DateTimeField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interactions', to='accounts.event')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_interactions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'event'), name='event_interaction_user_event_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentAffinity',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='affinity', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('vector', models.BinaryField(help_text='float16 affinity vector')),
+                ('interactions', models.PositiveIntegerField(default=0, help_text='Bookmarks and viewed events it was built from')),
+                ('built_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name_plural': 'student affinities',
+            },
+        ),
+    ]
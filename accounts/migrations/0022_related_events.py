@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0021_recommendations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeCursor',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('sequence', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RelatedEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField(help_text='Cosine similarity, 0 to 1')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbours', to='accounts.eventfeeditem')),
+                ('related', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='related_to', to='accounts.eventfeeditem')),
+            ],
+            options={
+                'ordering': ['event', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('event', 'rank'), name='related_event_rank_unique')],
+            },
+        ),
+    ]
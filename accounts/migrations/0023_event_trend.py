@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-19 05:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0022_related_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventTrend',
+            fields=[
+                ('event', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='trend', serialize=False, to='accounts.eventfeeditem')),
+                ('score', models.FloatField(default=0, help_text='Decayed score as of scored_at')),
+                ('scored_at', models.DateTimeField()),
+                ('rank_key', models.FloatField(help_text='ln(score) + time since epoch / decay constant')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-rank_key'], name='event_trend_rank_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0023_event_trend'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, help_text='Detail page views, written behind by accounts.counters'),
+        ),
+    ]
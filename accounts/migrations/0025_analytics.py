@@ -0,0 +1,57 @@
+# Generated by Django 5.2.5 on 2026-10-19 07:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0024_event_view_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InteractionLog',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('view', 'Detail page view'), ('bookmark', 'Bookmark'), ('click', 'Registration link click')], max_length=10)),
+                ('day', models.DateField(help_text='Local date the interactions happened')),
+                ('count', models.PositiveIntegerField(default=1)),
+                ('event', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='accounts.event')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event', 'day'], name='interaction_log_event_day_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='EventDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('bookmarks', models.PositiveIntegerField(default=0)),
+                ('clicks', models.PositiveIntegerField(default=0)),
+                ('event', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='daily_stats', to='accounts.event')),
+                ('organizer', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='accounts.userprofile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('event', 'day'), name='event_daily_stats_unique')],
+                'indexes': [models.Index(fields=['organizer', 'day'], name='event_daily_stats_org_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='OrganizerDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('bookmarks', models.PositiveIntegerField(default=0)),
+                ('clicks', models.PositiveIntegerField(default=0)),
+                ('organizer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='accounts.userprofile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('organizer', 'day'), name='organizer_daily_stats_unique')],
+            },
+        ),
+    ]
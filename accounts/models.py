@@ -20,8 +20,12 @@ Key Features:
 - Comprehensive event categorization system
 """
 
+from datetime import datetime, timedelta
+
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, router, transaction
+from django.utils import timezone
+from django.utils.text import Truncator
 
 
 class User(AbstractUser):
@@ -95,6 +99,10 @@ class UserProfile(models.Model):
         help_text="Profile picture uploaded to media/avatars/"
     )
 
+    # Audit timestamps
+    created_at = models.DateTimeField(auto_now_add=True, help_text="When the profile was created")
+    updated_at = models.DateTimeField(auto_now=True, help_text="When the profile was last changed")
+
     class Meta:
         # Prevent duplicate profiles - one user can only have one profile per type
         unique_together = ("user", "user_type")
@@ -104,6 +112,48 @@ class UserProfile(models.Model):
         return f"{self.user.username} ({self.user_type})"
 
 
+class EventQuerySet(models.QuerySet):
+    """
+    Time-based filters on the denormalized ``starts_at`` column.
+
+    All of these are single range conditions, so they can be served by the
+    (status/organizer, starts_at) indexes instead of combining date and time.
+    """
+
+    def upcoming(self, now=None):
+        """Events that have not started yet."""
+        return self.filter(starts_at__gte=now or timezone.now())
+
+    def past(self, now=None):
+        """Events that have already started."""
+        return self.filter(starts_at__lt=now or timezone.now())
+
+    def starting_within(self, days, now=None):
+        """Events starting between now and ``days`` days from now."""
+        now = now or timezone.now()
+        return self.filter(starts_at__gte=now, starts_at__lt=now + timedelta(days=days))
+
+
+class EventManager(models.Manager.from_queryset(EventQuerySet)):
+    """
+    Default Event manager that hides soft-deleted rows.
+
+    Use ``Event.objects.with_deleted()`` (or the ``Event.all_objects``
+    manager) where deleted events must be visible, e.g. in the admin.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+    def with_deleted(self):
+        """All events, including soft-deleted ones."""
+        return super().get_queryset()
+
+    def deleted_only(self):
+        """Only soft-deleted events."""
+        return super().get_queryset().filter(deleted_at__isnull=False)
+
+
 class Event(models.Model):
     """
     Event model for managing hackathons, workshops, internships, and tech events.
@@ -167,6 +217,13 @@ class Event(models.Model):
     time = models.TimeField(
         help_text="Event start time (HH:MM format)"
     )
+    starts_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        db_index=True,
+        editable=False,
+        help_text="Timezone-aware start (date + time), maintained on save for ordering and range queries"
+    )
     location = models.CharField(
         max_length=255,
         help_text="Event venue or online platform details"
@@ -200,9 +257,157 @@ class Event(models.Model):
     styling_applied = models.BooleanField(default=False, help_text="Whether auto-styling has been applied")
     is_featured = models.BooleanField(default=False, help_text="Featured events get special styling")
 
+    # Denormalized counters, only ever changed with F() updates (see COUNTER_FIELDS)
+    bookmark_count = models.PositiveIntegerField(default=0, help_text="Students who saved this event")
+    view_count = models.PositiveIntegerField(default=0, help_text="Detail page views, written behind by accounts.counters")
+
+    # Audit timestamps
+    created_at = models.DateTimeField(auto_now_add=True, help_text="When the event was submitted")
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, help_text="When the event was last changed")
+
+    objects = EventManager()
+    all_objects = EventQuerySet.as_manager()
+
+    # Maintained in place with F() expressions; save() never writes them
+    # back, so an instance loaded before a concurrent increment can't undo it
+    COUNTER_FIELDS = ("bookmark_count", "view_count")
+    # Persisted values save() compares against for the change log, the
+    # organizer stats and history invalidation
+    TRACKED_FIELDS = ("status", "deleted_at", "organizer_id", "starts_at")
+
+    class Meta:
+        # Indexes matching the hot access paths; `manage.py verify_event_indexes`
+        # checks with EXPLAIN that each of these queries still uses its index
+        indexes = [
+            # Student feed and live moderation counts: not deleted, by start time
+            models.Index(
+                fields=["status", "-starts_at"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="event_feed_idx",
+            ),
+            # Organizer dashboard: own active events, by start time
+            models.Index(
+                fields=["organizer", "-starts_at"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="event_organizer_idx",
+            ),
+            # Admin list filters and moderation counts
+            models.Index(fields=["status", "category", "-starts_at"], name="event_status_category_idx"),
+            models.Index(fields=["category", "-starts_at"], name="event_category_start_idx"),
+            models.Index(
+                fields=["-starts_at"],
+                condition=models.Q(is_featured=True),
+                name="event_featured_start_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.title
+
+    def compute_starts_at(self):
+        """Combine ``date`` and ``time`` into an aware datetime in the site timezone."""
+        event_date = self._meta.get_field("date").to_python(self.date)
+        event_time = self._meta.get_field("time").to_python(self.time)
+        if event_date is None or event_time is None:
+            return None
+        return timezone.make_aware(datetime.combine(event_date, event_time), timezone.get_default_timezone())
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded_state()
+        return instance
+
+    def _remember_loaded_state(self):
+        """Keep the persisted status/deletion/organizer/start so save() can tell what changed."""
+        deferred = self.get_deferred_fields()
+        self._loaded_state = {
+            name: self.__dict__.get(name) for name in self.TRACKED_FIELDS if name not in deferred
+        }
+
+    def _load_missing_state(self, using):
+        """
+        Read the persisted value of tracked fields that were deferred on load.
+
+        Reads them with ``values()`` rather than ``refresh_from_db`` so a
+        value assigned since loading is not overwritten.
+        """
+        loaded = self.__dict__.setdefault("_loaded_state", {})
+        missing = [name for name in self.TRACKED_FIELDS if name not in loaded]
+        if missing:
+            row = Event.all_objects.using(using).filter(pk=self.pk).values(*missing).first()
+            loaded.update(row or {})
+
+    def _change_action(self, creating):
+        """Classify this save for the EventChange log."""
+        if creating:
+            return EventChange.CREATED
+        loaded = getattr(self, "_loaded_state", {})
+        if self.deleted_at is not None and "deleted_at" in loaded and loaded["deleted_at"] is None:
+            return EventChange.DELETED
+        if self.status != loaded.get("status", self.status):
+            if self.status == "approved":
+                return EventChange.APPROVED
+            if self.status == "denied":
+                return EventChange.DENIED
+        return EventChange.UPDATED
+
+    def save(self, *args, actor=None, **kwargs):
+        """
+        Save the event and append an entry to the EventChange log.
+
+        ``starts_at`` is kept in sync with ``date`` and ``time``, and the
+        organizer's OrganizerStats counters are adjusted in the same
+        transaction. Every write goes to the event's own (campus) database,
+        whichever campus is active. ``actor`` is the user responsible for
+        the change, when known.
+        """
+        self.starts_at = self.compute_starts_at()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            extra = {"updated_at"}
+            if {"date", "time"} & set(update_fields):
+                extra.add("starts_at")
+            kwargs["update_fields"] = set(update_fields) | extra
+
+        creating = self._state.adding
+        using = kwargs.get("using") or router.db_for_write(self.__class__, instance=self)
+        with transaction.atomic(using=using):
+            if not creating:
+                self._load_missing_state(using)
+            action = self._change_action(creating)
+            loaded = getattr(self, "_loaded_state", {})
+            super().save(*args, **kwargs)
+            EventChange.record(self, action, actor=actor, using=using)
+            # One adjustment per side of the change. An organizer without
+            # counters is rebuilt from the table instead, which already
+            # reflects this save, so neither of its deltas may apply on top
+            rebuild = set()
+            if not creating and len(loaded) == len(self.TRACKED_FIELDS) and loaded["deleted_at"] is None:
+                if not OrganizerStats.adjust(loaded["organizer_id"], loaded["status"], -1, using):
+                    rebuild.add(loaded["organizer_id"])
+            if self.deleted_at is None and self.organizer_id not in rebuild:
+                if not OrganizerStats.adjust(self.organizer_id, self.status, +1, using):
+                    rebuild.add(self.organizer_id)
+            for organizer_id in rebuild:
+                OrganizerStats.rebuild(organizer_id, using)
+            EventFeedItem.sync(self, using)
+            # Cached pages of the past events history may list this event
+            # before or after the change. Bump their version only once the
+            # change is visible, so no reader caches the old rows as current
+            now = timezone.now()
+            if any(starts_at and starts_at < now for starts_at in (loaded.get("starts_at"), self.starts_at)):
+                from . import history
+                history.invalidate_on_commit(using)
+        self._remember_loaded_state()
     
+    def _do_update(self, base_qs, using, pk_val, values, *args, **kwargs):
+        # Leave the counters out of every UPDATE; the rest of Django's save
+        # (partial saves of deferred instances, INSERT when the row is gone)
+        # is unchanged
+        values = [value for value in values if value[0].name not in self.COUNTER_FIELDS]
+        return super()._do_update(base_qs, using, pk_val, values, *args, **kwargs)
+
     @property
     def is_deleted(self):
         """Check if event is soft deleted"""
@@ -210,10 +415,9 @@ class Event(models.Model):
     
     def soft_delete(self, deleted_by_user):
         """Soft delete the event"""
-        from django.utils import timezone
         self.deleted_at = timezone.now()
         self.deleted_by = deleted_by_user
-        self.save()
+        self.save(actor=deleted_by_user)
 
     def apply_auto_styling(self):
         """Automatically apply styling when event is approved"""
@@ -276,3 +480,606 @@ class Event(models.Model):
             self.is_featured = True
             
         self.save()
+
+
+class EventChangeQuerySet(models.QuerySet):
+    def since(self, sequence):
+        """Changes after ``sequence``, oldest first, for incremental consumers."""
+        return self.filter(sequence__gt=sequence).order_by("sequence")
+
+
+class EventChange(models.Model):
+    """
+    Append-only, monotonically sequenced log of event changes.
+
+    One row is written in the same transaction as every Event save. Feeds,
+    search indexing and exports remember the last ``sequence`` they processed
+    and read only newer rows with ``EventChange.objects.since(sequence)``.
+
+    ``event`` is stored without a database constraint so the log survives
+    events being archived or removed.
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    APPROVED = "approved"
+    DENIED = "denied"
+    DELETED = "deleted"
+    ARCHIVED = "archived"
+    ACTION_CHOICES = (
+        (CREATED, "Created"),
+        (UPDATED, "Updated"),
+        (APPROVED, "Approved"),
+        (DENIED, "Denied"),
+        (DELETED, "Deleted"),
+        (ARCHIVED, "Archived"),
+    )
+
+    # SQLite AUTOINCREMENT / Postgres sequence: never reused, always increasing
+    sequence = models.BigAutoField(primary_key=True)
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="changes",
+        help_text="The event that changed"
+    )
+    organizer = models.ForeignKey(
+        UserProfile,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+        help_text="Organizer of the event at the time of the change"
+    )
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    status = models.CharField(max_length=20, help_text="Event status after the change")
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="+",
+        help_text="User who made the change, when known"
+    )
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    objects = EventChangeQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["sequence"]
+
+    def __str__(self):
+        return f"#{self.sequence} {self.action} event {self.event_id}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("EventChange rows are append-only")
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def record(cls, event, action, actor=None, using=None):
+        if actor is not None and not getattr(actor, "is_authenticated", False):
+            actor = None
+        return cls.objects.using(using).create(
+            event_id=event.pk,
+            organizer_id=event.organizer_id,
+            action=action,
+            status=event.status,
+            actor=actor,
+        )
+
+    @classmethod
+    def latest_sequence(cls):
+        """Highest sequence number written so far (0 when the log is empty)."""
+        return cls.objects.aggregate(models.Max("sequence"))["sequence__max"] or 0
+
+
+class OrganizerStats(models.Model):
+    """
+    Denormalized per-organizer event counters for the dashboard header.
+
+    Counts cover the organizer's active (not soft-deleted) events. They are
+    adjusted with F() expressions inside the same transaction as each
+    Event save, so the dashboard reads them with a single primary-key lookup.
+    ``rebuild`` recomputes them from the events table when needed.
+    """
+
+    organizer = models.OneToOneField(
+        UserProfile,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        help_text="Organizer profile these counters belong to"
+    )
+    total_count = models.IntegerField(default=0)
+    pending_count = models.IntegerField(default=0)
+    approved_count = models.IntegerField(default=0)
+    denied_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "organizer stats"
+
+    def __str__(self):
+        return f"Stats for {self.organizer}"
+
+    @staticmethod
+    def count_events(organizer_id, using=None):
+        """Compute the counters from the events table with one conditional aggregate."""
+        return Event.objects.using(using).filter(organizer_id=organizer_id).aggregate(
+            total_count=models.Count("id"),
+            pending_count=models.Count("id", filter=models.Q(status="pending")),
+            approved_count=models.Count("id", filter=models.Q(status="approved")),
+            denied_count=models.Count("id", filter=models.Q(status="denied")),
+        )
+
+    @classmethod
+    def rebuild(cls, organizer_id, using=None):
+        """Recompute and store the counters for one organizer."""
+        stats, _ = cls.objects.using(using).update_or_create(
+            organizer_id=organizer_id, defaults=cls.count_events(organizer_id, using)
+        )
+        return stats
+
+    @classmethod
+    def for_organizer(cls, organizer):
+        """Return the organizer's counters, building them on first use."""
+        try:
+            return cls.objects.get(pk=organizer.pk)
+        except cls.DoesNotExist:
+            return cls.rebuild(organizer.pk)
+
+    @classmethod
+    def adjust(cls, organizer_id, status, delta, using=None):
+        """
+        Add ``delta`` to the total and to the counter for ``status``.
+
+        Returns False when the organizer has no counters yet; the caller
+        then rebuilds them instead of adjusting.
+        """
+        if organizer_id is None:
+            return True
+        changes = {"total_count": models.F("total_count") + delta}
+        status_field = f"{status}_count"
+        if status_field in ("pending_count", "approved_count", "denied_count"):
+            changes[status_field] = models.F(status_field) + delta
+        return bool(cls.objects.using(using).filter(pk=organizer_id).update(**changes))
+
+
+class EventFeedItem(models.Model):
+    """
+    Precomputed student feed card for one approved, active event.
+
+    Holds exactly what a card renders (organizer display name, truncated
+    description, resolved image URL, theme, category label), so the student
+    feed is a single-table range scan on ``starts_at`` with no joins and no
+    per-row template work. Rows are written by ``sync`` from ``Event.save``:
+    an event gets a row while it is approved and not deleted, and loses it
+    otherwise. ``manage.py rebuild_event_feed`` rebuilds the whole table.
+    """
+
+    SUMMARY_WORDS = 20
+
+    event = models.OneToOneField(
+        Event,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="feed_item",
+    )
+    organizer_user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text="Used to refresh organizer_name when the user is renamed",
+    )
+    title = models.CharField(max_length=255)
+    category = models.CharField(max_length=20)
+    category_label = models.CharField(max_length=50)
+    date = models.DateField()
+    time = models.TimeField()
+    starts_at = models.DateTimeField(blank=True, null=True)
+    location = models.CharField(max_length=255)
+    organizer_name = models.CharField(max_length=150)
+    summary = models.TextField(blank=True)
+    image_url = models.CharField(max_length=500, blank=True)
+    color_theme = models.CharField(max_length=20, blank=True)
+    is_featured = models.BooleanField(default=False)
+    vector = models.BinaryField(blank=True, default=b"", help_text="Feature vector used to rank the feed per student")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["starts_at"]
+        indexes = [
+            models.Index(fields=["starts_at"], name="event_feed_item_start_idx"),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    @classmethod
+    def values_for(cls, event):
+        """Card fields for ``event``, computed once at write time."""
+        from . import recommendations
+
+        return {**cls.card_for(event), "vector": recommendations.event_vector(event)}
+
+    @classmethod
+    def card_for(cls, event):
+        """The card fields of ``values_for``, without the recommendation vector."""
+        user = event.organizer.user
+        if event.event_flyer:
+            image_url = event.event_flyer.url
+        else:
+            image_url = event.featured_image or ""
+        return {
+            "organizer_user": user,
+            "title": event.title,
+            "category": event.category,
+            "category_label": event.get_category_display(),
+            "date": event.date,
+            "time": event.time,
+            "starts_at": event.starts_at,
+            "location": event.location,
+            "organizer_name": user.first_name or user.username,
+            "summary": Truncator(event.description or "").words(cls.SUMMARY_WORDS),
+            "image_url": image_url,
+            "color_theme": event.color_theme or "",
+            "is_featured": event.is_featured,
+        }
+
+    @classmethod
+    def sync(cls, event, using=None):
+        """Create, refresh or remove the feed row for ``event``."""
+        if event.status == "approved" and event.deleted_at is None:
+            cls.objects.using(using).update_or_create(event=event, defaults=cls.values_for(event))
+        else:
+            cls.objects.using(using).filter(event_id=event.pk).delete()
+
+
+class ArchivedEvent(models.Model):
+    """
+    Cold storage for events moved out of the live ``accounts_event`` table.
+
+    ``manage.py archive_events`` moves soft-deleted events and events older
+    than the retention window here in batches, keeping the live table and its
+    indexes small. Rows keep their original primary key in ``original_id`` so
+    they can be restored with ``archive_events --restore``.
+    """
+
+    REASON_DELETED = "deleted"
+    REASON_EXPIRED = "expired"
+    REASON_CHOICES = (
+        (REASON_DELETED, "Soft-deleted"),
+        (REASON_EXPIRED, "Past retention window"),
+    )
+
+    original_id = models.BigIntegerField(unique=True, help_text="Primary key the event had in the live table")
+    organizer = models.ForeignKey(
+        UserProfile,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="archived_events",
+    )
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    category = models.CharField(max_length=20, choices=Event.CATEGORY_CHOICES)
+    date = models.DateField()
+    time = models.TimeField()
+    starts_at = models.DateTimeField(blank=True, null=True, db_index=True)
+    location = models.CharField(max_length=255)
+    event_flyer = models.CharField(max_length=100, blank=True, null=True, help_text="Stored file name of the flyer")
+    event_link = models.URLField()
+    additional_details = models.TextField(blank=True, null=True)
+    contact_email = models.EmailField(blank=True, null=True)
+    requirements = models.TextField(blank=True, null=True)
+    prizes = models.TextField(blank=True, null=True)
+    status = models.CharField(max_length=20, choices=Event.STATUS_CHOICES)
+    denial_reason = models.TextField(blank=True, null=True)
+    deleted_at = models.DateTimeField(blank=True, null=True)
+    deleted_by = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        blank=True,
+        null=True,
+        related_name="+",
+    )
+    featured_image = models.URLField(blank=True, null=True)
+    color_theme = models.CharField(max_length=20, blank=True, null=True)
+    styling_applied = models.BooleanField(default=False)
+    is_featured = models.BooleanField(default=False)
+    view_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    archived_at = models.DateTimeField(auto_now_add=True)
+    archive_reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+
+    # Columns copied verbatim between Event and ArchivedEvent
+    COPIED_FIELDS = (
+        "organizer_id", "title", "description", "category", "date", "time", "starts_at",
+        "location", "event_flyer", "event_link", "additional_details", "contact_email",
+        "requirements", "prizes", "status", "denial_reason", "deleted_at", "deleted_by_id",
+        "featured_image", "color_theme", "styling_applied", "is_featured", "view_count",
+        "created_at", "updated_at",
+    )
+
+    class Meta:
+        ordering = ["-starts_at"]
+
+    def __str__(self):
+        return f"{self.title} (archived)"
+
+
+class Bookmark(models.Model):
+    """
+    An event a student saved.
+
+    Written in batches by ``bookmarks.sync``, which keeps
+    ``Event.bookmark_count`` up to date in the same transaction.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="bookmarks")
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="bookmarks")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "event"], name="bookmark_user_event_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} saved {self.event_id}"
+
+
+class BookmarkList(models.Model):
+    """
+    Version number of a user's bookmark set.
+
+    Bumped whenever a sync changes the set, so a client that sends the
+    version it last saw learns whether it has to replace its local copy.
+    Its row is also the lock that serializes concurrent syncs of one user.
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="bookmark_list")
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Bookmarks of {self.user} (v{self.version})"
+
+
+class EventInteraction(models.Model):
+    """
+    How often a student opened an event's detail page.
+
+    One row per (user, event), bumped in place by
+    ``recommendations.record_views`` when the ``counters.student_views``
+    buffer is flushed; together with bookmarks it is the input to the
+    students' affinity vectors.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="event_interactions")
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="interactions")
+    views = models.PositiveIntegerField(default=0)
+    last_viewed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "event"], name="event_interaction_user_event_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} viewed {self.event_id} ({self.views}x)"
+
+
+class ArchivedBookmark(models.Model):
+    """
+    A student's bookmark of an archived event.
+
+    Moved out of ``Bookmark`` with the event, since deleting the live event
+    cascades to its bookmarks, and put back by ``archive_events --restore``.
+    """
+
+    archived_event = models.ForeignKey(ArchivedEvent, on_delete=models.CASCADE, related_name="bookmarks")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user} saved archived {self.archived_event_id}"
+
+
+class ArchivedInteraction(models.Model):
+    """A student's ``EventInteraction`` with an archived event, kept for restoring it."""
+
+    archived_event = models.ForeignKey(ArchivedEvent, on_delete=models.CASCADE, related_name="interactions")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    views = models.PositiveIntegerField(default=0)
+    last_viewed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user} viewed archived {self.archived_event_id} ({self.views}x)"
+
+
+class StudentAffinity(models.Model):
+    """
+    A student's precomputed category/organizer/keyword affinity vector.
+
+    Built for all students at once by ``manage.py build_affinity_vectors``
+    and read with one primary-key lookup to rank the student feed (see
+    ``accounts.recommendations``). Students without a row are ranked
+    soonest-first.
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="affinity")
+    vector = models.BinaryField(help_text="float16 affinity vector")
+    interactions = models.PositiveIntegerField(default=0, help_text="Bookmarks and viewed events it was built from")
+    built_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "student affinities"
+
+    def __str__(self):
+        return f"Affinity of {self.user}"
+
+
+class RelatedEvent(models.Model):
+    """
+    One precomputed "similar event" of a feed event, by TF-IDF cosine similarity.
+
+    Each event keeps its top RELATED_EVENTS_TOP_K neighbours, ``rank`` 0
+    being the closest, written by ``manage.py build_related_events`` (see
+    ``accounts.related``). ``related`` has no database constraint: when a
+    neighbour leaves the feed its rows linger until the next run replaces
+    them, and readers drop them by joining on the feed table.
+    """
+
+    event = models.ForeignKey(EventFeedItem, on_delete=models.CASCADE, related_name="neighbours")
+    related = models.ForeignKey(
+        EventFeedItem,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="related_to",
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField(help_text="Cosine similarity, 0 to 1")
+
+    class Meta:
+        ordering = ["event", "rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["event", "rank"], name="related_event_rank_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} ~ {self.related_id} ({self.score:.2f})"
+
+
+class ChangeCursor(models.Model):
+    """
+    How far an incremental consumer has read the ``EventChange`` log.
+
+    Consumers process ``EventChange.objects.since(cursor.sequence)`` and then
+    store the last sequence they handled, so each run only looks at what
+    changed since the previous one.
+
+    Ids are allocated on INSERT but become visible on COMMIT, so (on
+    Postgres) a lower id can appear after a higher one was read. Consumers
+    whose processing is idempotent re-read a window of ids behind the
+    cursor on every run to pick such rows up.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    sequence = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} at {self.sequence}"
+
+
+class EventTrend(models.Model):
+    """
+    Exponentially decayed interaction score of a feed event.
+
+    Updated in place with one UPDATE per interaction by
+    ``accounts.trending``; ``rank_key`` is the score in log space against a
+    fixed epoch, which orders events by their current score without ever
+    being rewritten as time passes, so top-N reads walk its index. Rows
+    whose event left the feed are removed by ``manage.py compact_trending``.
+    """
+
+    event = models.OneToOneField(
+        EventFeedItem,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        primary_key=True,
+        related_name="trend",
+    )
+    score = models.FloatField(default=0, help_text="Decayed score as of scored_at")
+    scored_at = models.DateTimeField()
+    rank_key = models.FloatField(help_text="ln(score) + time since epoch / decay constant")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-rank_key"], name="event_trend_rank_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id}: {self.score:.2f} at {self.scored_at:%Y-%m-%d %H:%M}"
+
+
+class InteractionLog(models.Model):
+    """
+    Append-only raw interaction counts awaiting rollup.
+
+    Written in batches: views and registration-link clicks by the
+    write-behind buffers in ``accounts.counters`` (one row per event per
+    flush), bookmarks by each sync. ``manage.py rollup_analytics`` folds new
+    rows into the daily stats tables and prunes old ones.
+    """
+
+    VIEW = "view"
+    BOOKMARK = "bookmark"
+    CLICK = "click"
+    KIND_CHOICES = (
+        (VIEW, "Detail page view"),
+        (BOOKMARK, "Bookmark"),
+        (CLICK, "Registration link click"),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    event = models.ForeignKey(Event, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    day = models.DateField(help_text="Local date the interactions happened")
+    count = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["event", "day"], name="interaction_log_event_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.count} {self.kind} on {self.event_id} ({self.day})"
+
+
+class EventDailyStats(models.Model):
+    """Views, bookmarks and link clicks of one event on one day, from ``InteractionLog``."""
+
+    event = models.ForeignKey(Event, on_delete=models.DO_NOTHING, db_constraint=False, related_name="daily_stats")
+    organizer = models.ForeignKey(UserProfile, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+")
+    day = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    bookmarks = models.PositiveIntegerField(default=0)
+    clicks = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["event", "day"], name="event_daily_stats_unique"),
+        ]
+        indexes = [
+            # Organizer dashboard charts: all of one organizer's events over a date range
+            models.Index(fields=["organizer", "day"], name="event_daily_stats_org_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} on {self.day}"
+
+
+class OrganizerDailyStats(models.Model):
+    """Totals of ``EventDailyStats`` per organizer and day."""
+
+    organizer = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="daily_stats")
+    day = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    bookmarks = models.PositiveIntegerField(default=0)
+    clicks = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["organizer", "day"], name="organizer_daily_stats_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.organizer_id} on {self.day}"
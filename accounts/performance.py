@@ -0,0 +1,158 @@
+"""
+=========================================
+PER-REQUEST PERFORMANCE INSTRUMENTATION
+=========================================
+
+Lightweight timing helpers used by ``ServerTimingMiddleware``.
+
+Each sampled request gets a ``RequestTimings`` object stored in a context
+variable. Code anywhere in the request (ORM, template rendering, calls to
+``APIHandler``) adds its elapsed time to a named bucket, and the middleware
+turns the buckets into a ``Server-Timing`` header and one log line.
+
+Unsampled requests never create a ``RequestTimings`` object, so every helper
+in this module is a cheap no-op for them.
+"""
+
+import contextvars
+import functools
+import time
+
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates, Template
+
+
+# Timings for the request currently being served (None when not sampled)
+_current_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """Accumulated durations (in seconds) and counts for a single request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {}
+        self.counts = {}
+
+    def add(self, name, elapsed):
+        """Add ``elapsed`` seconds to bucket ``name`` and bump its count."""
+        self.durations[name] = self.durations.get(name, 0.0) + elapsed
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def total(self):
+        """Seconds elapsed since the request started."""
+        return time.perf_counter() - self.started
+
+    def as_header(self):
+        """Render the buckets in ``Server-Timing`` header syntax."""
+        parts = [f"total;dur={self.total() * 1000:.1f}"]
+        for name, elapsed in self.durations.items():
+            parts.append(f'{name};dur={elapsed * 1000:.1f};desc="{self.counts[name]} calls"')
+        return ", ".join(parts)
+
+    def as_log_fields(self):
+        """Flat dict suitable for a structured log line."""
+        fields = {"total_ms": round(self.total() * 1000, 1)}
+        for name, elapsed in self.durations.items():
+            fields[f"{name}_ms"] = round(elapsed * 1000, 1)
+            fields[f"{name}_count"] = self.counts[name]
+        return fields
+
+
+def start_request():
+    """Begin collecting timings for the current request."""
+    timings = RequestTimings()
+    token = _current_timings.set(timings)
+    return timings, token
+
+
+def finish_request(token):
+    """Stop collecting timings for the current request."""
+    _current_timings.reset(token)
+
+
+def current_timings():
+    """Return the active ``RequestTimings`` or None if not sampled."""
+    return _current_timings.get()
+
+
+class track:
+    """
+    Context manager adding the enclosed block's duration to bucket ``name``.
+
+    Usage:
+        with track("api"):
+            response = requests.get(...)
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.timings = None
+
+    def __enter__(self):
+        self.timings = _current_timings.get()
+        if self.timings is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.timings is not None:
+            self.timings.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def timed(name):
+    """Decorator version of ``track`` for functions and methods."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def query_timer(execute, sql, params, many, context):
+    """
+    Database execute wrapper timing every query into the ``db`` bucket.
+
+    Attached to every connection by ``install()`` rather than per request:
+    async views run their queries on worker-thread connections the
+    middleware never sees, and the context variable still finds the request.
+    """
+    with track("db"):
+        return execute(sql, params, many, context)
+
+
+def _install_query_timer(sender, connection, **kwargs):
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+def install():
+    """Attach ``query_timer`` to every database connection as it is opened."""
+    connection_created.connect(_install_query_timer, dispatch_uid="performance_query_timer")
+
+
+class TimedTemplate(Template):
+    """Django template wrapper that records render time in the ``template`` bucket."""
+
+    def render(self, context=None, request=None):
+        with track("template"):
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    Drop-in replacement for the DjangoTemplates backend.
+
+    Returns ``TimedTemplate`` objects so ``render()`` calls are timed without
+    touching any view code.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
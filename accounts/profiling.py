@@ -0,0 +1,267 @@
+"""
+=========================================
+SAMPLING PROFILER FOR PRODUCTION REQUESTS
+=========================================
+
+Captures profiles for a small, configurable subset of requests so slow
+dashboards can be investigated without attaching a profiler.
+
+Two capture modes are used by ``ProfilingMiddleware``:
+- Sampled requests (PROFILING_SAMPLE_RATE / PROFILING_VIEW_RATES) run under
+  cProfile and are saved as ``.prof`` files readable by ``pstats``.
+- When PROFILING_THRESHOLD_MS is set, every other request is watched by a
+  cheap stack sampler thread. The samples are only written to disk (as
+  ``.stacks.json``) if the request turns out to be slower than the threshold.
+
+Under WSGI an async view runs on the event loop thread of ``async_to_sync``
+while the middleware (and any thread-sensitive ``sync_to_async`` work, such
+as ORM calls) stays on the request thread. Async views are therefore wrapped
+in ``profile_async_view``, which profiles the loop thread as well; both
+threads end up in the same saved profile.
+
+Profiles are stored in PROFILING_DIR and rotated so that at most
+PROFILING_MAX_FILES are kept. ``list_profiles`` and ``load_profile`` back the
+staff-only browser in ``CustomAdminSite``.
+"""
+
+import cProfile
+import functools
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+
+PROFILE_SUFFIXES = (".prof", ".stacks.json")
+
+
+def profile_dir():
+    return str(getattr(settings, "PROFILING_DIR", os.path.join(settings.BASE_DIR, "profiles")))
+
+
+class StackSampler:
+    """
+    Background thread sampling the Python stacks of registered threads.
+
+    Watching a request costs one dict insert; the sampler itself wakes every
+    PROFILING_SAMPLE_INTERVAL seconds and only while threads are registered.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._watched = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def start_watching(self, thread_id):
+        with self._lock:
+            self._watched[thread_id] = Counter()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def stop_watching(self, thread_id):
+        with self._lock:
+            return self._watched.pop(thread_id, Counter())
+
+    def _run(self):
+        while True:
+            with self._lock:
+                watched = list(self._watched)
+            if not watched:
+                self._wakeup.clear()
+                self._wakeup.wait()
+                continue
+            frames = sys._current_frames()
+            stacks = {thread_id: _collapse(frames[thread_id]) for thread_id in watched if thread_id in frames}
+            with self._lock:
+                for thread_id, stack in stacks.items():
+                    # The request may have finished while we were sampling
+                    if thread_id in self._watched:
+                        self._watched[thread_id][stack] += 1
+            time.sleep(self.interval)
+
+
+def _collapse(frame):
+    """Return the stack as a tuple of ``file:line(function)`` from outermost to innermost."""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_filename}:{code.co_firstlineno}({code.co_name})")
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+_sampler = None
+
+
+def get_sampler():
+    global _sampler
+    if _sampler is None:
+        _sampler = StackSampler(getattr(settings, "PROFILING_SAMPLE_INTERVAL", 0.005))
+    return _sampler
+
+
+def profile_async_view(view):
+    """
+    Profile an async view on the thread its coroutine actually runs on.
+
+    ``ProfilingMiddleware`` sets ``request._profiling_mode`` to ``"cprofile"``
+    or ``"stacks"``; the result is left on the request as
+    ``_view_profiler`` / ``_view_samples`` for the middleware to save.
+    Apply it directly to the ``async def`` so that outer decorators copy
+    the ``profiles_own_thread`` marker.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        mode = getattr(request, "_profiling_mode", None)
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                return await view(request, *args, **kwargs)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                profiler.disable()
+                request._view_profiler = profiler
+        if mode == "stacks":
+            thread_id = threading.get_ident()
+            get_sampler().start_watching(thread_id)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                request._view_samples = get_sampler().stop_watching(thread_id)
+        return await view(request, *args, **kwargs)
+
+    wrapper.profiles_own_thread = True
+    return wrapper
+
+
+# ----------------------------------------------------------------------
+# Storage
+# ----------------------------------------------------------------------
+def _filename(view_name, elapsed_ms, suffix):
+    safe_view = re.sub(r"[^A-Za-z0-9-]+", "-", view_name or "unresolved")
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return f"{stamp}_{os.getpid()}_{safe_view}_{int(elapsed_ms)}ms{suffix}"
+
+
+def save_cprofile(profiler, view_name, elapsed_ms, *others):
+    """Save ``profiler``, merged with the profiles of ``others`` (other threads of the request)."""
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, _filename(view_name, elapsed_ms, ".prof"))
+    if others:
+        stats = pstats.Stats(profiler)
+        for other in others:
+            stats.add(other)
+        stats.dump_stats(path)
+    else:
+        profiler.dump_stats(path)
+    rotate()
+    return path
+
+
+def save_stack_samples(samples, view_name, elapsed_ms):
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, _filename(view_name, elapsed_ms, ".stacks.json"))
+    with open(path, "w") as handle:
+        json.dump({
+            "interval": get_sampler().interval,
+            "stacks": [[list(stack), count] for stack, count in samples.items()],
+        }, handle)
+    rotate()
+    return path
+
+
+def rotate():
+    """Delete the oldest profiles beyond PROFILING_MAX_FILES."""
+    max_files = getattr(settings, "PROFILING_MAX_FILES", 200)
+    entries = list_profiles()
+    for entry in entries[max_files:]:
+        try:
+            os.remove(entry["path"])
+        except OSError:
+            pass
+
+
+def list_profiles():
+    """Return stored profiles, newest first, with metadata parsed from the file name."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    entries = []
+    for name in os.listdir(directory):
+        if not name.endswith(PROFILE_SUFFIXES):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        parts = name.split("_")
+        entries.append({
+            "name": name,
+            "path": path,
+            "view": parts[2] if len(parts) > 3 else "",
+            "duration": parts[-1].split(".")[0] if len(parts) > 3 else "",
+            "kind": "cProfile" if name.endswith(".prof") else "stack samples",
+            "size": stat.st_size,
+            "modified": stat.st_mtime,
+        })
+    entries.sort(key=lambda entry: entry["modified"], reverse=True)
+    return entries
+
+
+def load_profile(name, limit=40):
+    """
+    Return the top ``limit`` functions of a stored profile by cumulative time.
+
+    Each row has ``function``, ``calls``, ``self`` and ``cumulative``; for stack
+    samples the time columns are estimated from sample counts.
+    """
+    if os.path.basename(name) != name or not name.endswith(PROFILE_SUFFIXES):
+        raise FileNotFoundError(name)
+    path = os.path.join(profile_dir(), name)
+
+    if name.endswith(".prof"):
+        stats = pstats.Stats(path)
+        rows = []
+        for (filename, line, function), (cc, nc, tt, ct, callers) in stats.stats.items():
+            rows.append({
+                "function": f"{filename}:{line}({function})",
+                "calls": nc,
+                "self": tt,
+                "cumulative": ct,
+            })
+    else:
+        with open(path) as handle:
+            data = json.load(handle)
+        interval = data["interval"]
+        cumulative, own = Counter(), Counter()
+        for stack, count in data["stacks"]:
+            for function in set(stack):
+                cumulative[function] += count
+            if stack:
+                own[stack[-1]] += count
+        rows = [{
+            "function": function,
+            "calls": count,
+            "self": own[function] * interval,
+            "cumulative": count * interval,
+        } for function, count in cumulative.items()]
+
+    rows.sort(key=lambda row: row["cumulative"], reverse=True)
+    return rows[:limit]
+
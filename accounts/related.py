@@ -0,0 +1,182 @@
+"""
+=========================================
+RELATED EVENTS
+=========================================
+
+The "Similar events" panel on the event detail page. Similarity is the
+cosine between TF-IDF vectors of each event's title (words counted
+double), description and category. It is computed offline and stored as
+the top RELATED_EVENTS_TOP_K upcoming neighbours per event in
+``RelatedEvent``. The page then reads its panel with one indexed lookup.
+
+``update()`` (``manage.py build_related_events``) works in NumPy batches:
+- all feed events become one row-normalized TF-IDF matrix; words are
+  hashed into FEATURES columns, so the columns mean the same thing from
+  one run to the next without storing a vocabulary
+- neighbour lists are one matrix product per batch of events against the
+  upcoming events, with ``np.argpartition`` picking the top K
+
+Runs are incremental: a ``ChangeCursor`` remembers the last ``EventChange``
+handled, and each run also re-reads the RESCAN changes before it in case
+one committed late. Only these neighbour lists are recomputed:
+- lists of events that changed since the last run
+- lists that point at an event that left the feed or has already started
+- lists that a new or edited upcoming event now belongs in, because it
+  scores above the list's weakest entry
+
+Unaffected lists keep the scores from the run that wrote them, even though
+IDF weights drift slightly as events come and go. ``--full`` rebuilds
+everything.
+"""
+
+import zlib
+
+import numpy as np
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ChangeCursor, EventChange, EventFeedItem, RelatedEvent
+from .recommendations import keywords
+
+CURSOR = "related_events"
+FEATURES = 2048
+RESCAN = 100  # Changes re-read behind the cursor; recomputing a list twice is harmless
+
+
+def _feature(term):
+    return zlib.crc32(term.encode()) % FEATURES
+
+
+def tfidf_matrix(events):
+    """Row-normalized float32 TF-IDF matrix for dicts with title, description and category."""
+    counts = np.zeros((len(events), FEATURES), dtype=np.float32)
+    rows, columns, weights = [], [], []
+    for row, event in enumerate(events):
+        terms = [(word, 2.0) for word in keywords(event["title"])]
+        terms += [(word, 1.0) for word in keywords(event["description"])]
+        terms.append((f"category:{event['category']}", 2.0))
+        for term, weight in terms:
+            rows.append(row)
+            columns.append(_feature(term))
+            weights.append(weight)
+    np.add.at(counts, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), weights)
+
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(events)) / (1 + document_frequency)) + 1
+    matrix = np.log1p(counts) * idf.astype(np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def top_neighbours(matrix, rows, candidates, k, batch_size=500):
+    """
+    Yield ``(row, neighbour_rows, scores)`` for each of ``rows``: its ``k``
+    most similar ``candidates`` with a positive score, best first, itself
+    excluded.
+    """
+    if not len(candidates):
+        for row in rows:
+            yield row, candidates, np.zeros(0, dtype=np.float32)
+        return
+    candidate_matrix = matrix[candidates].T
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        scores = matrix[batch] @ candidate_matrix
+        scores[np.equal.outer(batch, candidates)] = -1.0  # Never related to itself
+        top = min(k, len(candidates))
+        best = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        for row, neighbours, neighbour_scores in zip(batch, best, best_scores):
+            keep = neighbour_scores > 0
+            yield row, candidates[neighbours[keep]], neighbour_scores[keep]
+
+
+def _affected(matrix, event_ids, candidates, changed_ids, k):
+    """Rows whose stored neighbour list may be wrong after ``changed_ids`` changed."""
+    index = {int(event_id): row for row, event_id in enumerate(event_ids)}
+    upcoming = set(event_ids[candidates].tolist())
+    affected = {index[event_id] for event_id in changed_ids if event_id in index}
+
+    stored = {}  # row -> (neighbour count, weakest score)
+    for event_id, related_id, score in RelatedEvent.objects.values_list("event_id", "related_id", "score"):
+        row = index.get(event_id)
+        if row is None:
+            continue
+        if related_id not in upcoming or related_id in changed_ids:
+            affected.add(row)  # Neighbour edited, removed, unapproved or already started
+        count, weakest = stored.get(row, (0, 1.0))
+        stored[row] = (count + 1, min(weakest, score))
+
+    # A changed upcoming event enters any list where it beats the weakest entry
+    entering = np.array([index[event_id] for event_id in changed_ids if event_id in upcoming], dtype=np.intp)
+    if len(entering):
+        thresholds = np.zeros(len(event_ids), dtype=np.float32)
+        for row, (count, weakest) in stored.items():
+            thresholds[row] = weakest if count >= k else 0.0
+        scores = matrix @ matrix[entering].T
+        scores[np.equal.outer(np.arange(len(event_ids)), entering)] = 0.0
+        affected.update(np.flatnonzero((scores > thresholds[:, None]).any(axis=1)).tolist())
+    return affected
+
+
+def update(full=False, batch_size=500):
+    """
+    Bring ``RelatedEvent`` of the active campus up to date with its ``EventChange`` log.
+
+    Returns ``(events, recomputed)``: feed events considered and neighbour
+    lists rewritten.
+    """
+    k = settings.RELATED_EVENTS_TOP_K
+    cursor, _ = ChangeCursor.objects.get_or_create(name=CURSOR)
+    latest = EventChange.objects.order_by("-sequence").values_list("sequence", flat=True).first() or 0
+
+    items = list(EventFeedItem.objects.order_by("event_id").values(
+        "event_id", "starts_at", "category", "title", description=F("event__description")
+    ))
+    event_ids = np.array([item["event_id"] for item in items], dtype=np.int64)
+    matrix = tfidf_matrix(items)
+    now = timezone.now()
+    candidates = np.array(
+        [row for row, item in enumerate(items) if item["starts_at"] and item["starts_at"] >= now], dtype=np.intp
+    )
+
+    if full:
+        rows = list(range(len(items)))
+    else:
+        changed_ids = set(
+            EventChange.objects.since(max(cursor.sequence - RESCAN, 0))
+            .filter(sequence__lte=latest).values_list("event_id", flat=True)
+        )
+        rows = sorted(_affected(matrix, event_ids, candidates, changed_ids, k))
+
+    new_rows = [
+        RelatedEvent(event_id=int(event_ids[row]), related_id=int(event_ids[neighbour]), rank=rank, score=float(score))
+        for row, neighbours, scores in top_neighbours(matrix, np.array(rows, dtype=np.intp), candidates, k, batch_size)
+        for rank, (neighbour, score) in enumerate(zip(neighbours, scores))
+    ]
+
+    with transaction.atomic(using=router.db_for_write(RelatedEvent)):
+        if full:
+            RelatedEvent.objects.all().delete()
+        else:
+            recomputed_ids = [int(event_ids[row]) for row in rows]
+            for start in range(0, len(recomputed_ids), batch_size):
+                RelatedEvent.objects.filter(event_id__in=recomputed_ids[start:start + batch_size]).delete()
+        RelatedEvent.objects.bulk_create(new_rows, batch_size=batch_size)
+        ChangeCursor.objects.filter(pk=cursor.pk).update(sequence=latest)
+    return len(items), len(rows)
+
+
+def for_event(event_id):
+    """Upcoming events most similar to ``event_id``, closest first: one indexed lookup."""
+    return (
+        EventFeedItem.objects.filter(related_to__event_id=event_id, starts_at__gte=timezone.now())
+        .defer("vector")
+        .order_by("related_to__rank")[:settings.RELATED_EVENTS_SHOWN]
+    )
@@ -0,0 +1,118 @@
+"""
+=========================================
+READ/WRITE DATABASE ROUTING
+=========================================
+
+Sends read-only queries from read-heavy views (feeds, event detail, search,
+exports) to replica databases and everything else to the primary.
+
+How it fits together:
+- ``ReplicaRoutingMiddleware`` opts a request in when its view is listed in
+  DATABASE_REPLICA_VIEWS, the method is safe and the user has no recent
+  write of their own (see stickiness below).
+- ``ReplicaRouter`` then sends reads of DATABASE_REPLICA_MODELS to one of
+  DATABASE_REPLICAS. Sessions, users and everything else always read from
+  the primary, as does any query inside a transaction on the primary.
+- Writes always go to the primary. A write to a replicated model marks the
+  request, and the middleware sets a short-lived cookie so the user's next
+  requests read from the primary for DATABASE_REPLICA_STICKY_SECONDS
+  (read-your-writes, e.g. the organizer dashboard right after create_event).
+
+With no replicas configured the router is a no-op. ``manage.py
+sync_replica`` copies the primary into a local SQLite replica file, standing
+in for real replication during development.
+"""
+
+import contextlib
+import contextvars
+import random
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class RoutingState:
+    """Per-request routing decision plus whether a replicated model was written."""
+
+    def __init__(self, use_replica=False):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+_state = contextvars.ContextVar("db_routing_state", default=None)
+
+
+def start_request():
+    """Begin routing for a request; reads go to the primary until opted in."""
+    state = RoutingState()
+    return state, _state.set(state)
+
+
+def finish_request(token):
+    _state.reset(token)
+
+
+@contextlib.contextmanager
+def use_replica():
+    """Read replicated models from a replica inside the block, e.g. in an export task."""
+    state = RoutingState(use_replica=True)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def replicas():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def _replicated(model):
+    return model._meta.label_lower in {
+        label.lower() for label in getattr(settings, "DATABASE_REPLICA_MODELS", ())
+    }
+
+
+class ReplicaRouter:
+    """Database router sending opted-in reads to replicas and all writes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db  # Follow relations on the database the row came from
+        state = _state.get()
+        if state is None or not state.use_replica or not _replicated(model):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS  # Reads inside a write transaction must see its changes
+        aliases = replicas()
+        return random.choice(aliases) if aliases else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and _replicated(model):
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # Replicas are copies of the primary
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive their schema from the primary via replication
+        return db not in replicas()
+
+
+def sync_sqlite_replica(alias):
+    """
+    Replication stand-in: copy the primary SQLite database into replica ``alias``.
+
+    Uses SQLite's online backup API, so the primary stays writable while it
+    runs. Returns the number of pages copied.
+    """
+    primary, replica = connections[DEFAULT_DB_ALIAS], connections[alias]
+    if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+        raise ValueError("sync_sqlite_replica only supports SQLite databases")
+    primary.ensure_connection()
+    replica.ensure_connection()
+    primary.connection.backup(replica.connection)
+    return replica.connection.execute("PRAGMA page_count").fetchone()[0]
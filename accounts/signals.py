@@ -1,16 +1,39 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
-# from django.contrib.auth.models import User
-from django.contrib.auth import get_user_model
-User = get_user_model()
 
-from .models import UserProfile
+from . import bookmarks, live
+from .models import Event, EventChange, EventFeedItem, OrganizerStats, User
+
+
+@receiver(post_delete, sender=Event)
+def remove_deleted_event_from_stats(sender, instance, **kwargs):
+    """Hard deletes (e.g. the admin delete action) bypass Event.save()"""
+    using = instance._state.db
+    if instance.deleted_at is None and not OrganizerStats.adjust(instance.organizer_id, instance.status, -1, using):
+        OrganizerStats.rebuild(instance.organizer_id, using)
+
 
 @receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
+def refresh_feed_organizer_name(sender, instance, created, update_fields=None, **kwargs):
+    """Keep the denormalized organizer name on feed cards in step with the user"""
     if created:
-        UserProfile.objects.create(user=instance)
+        return
+    if update_fields is not None and not {"first_name", "username"} & set(update_fields):
+        return  # e.g. last_login updates on every sign-in
+    EventFeedItem.objects.filter(organizer_user=instance).update(
+        organizer_name=instance.first_name or instance.username
+    )
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    instance.userprofile.save()
+
+@receiver(pre_delete, sender=User)
+def release_deleted_user_bookmarks(sender, instance, **kwargs):
+    """The cascade deletes the user's bookmarks without touching Event.bookmark_count"""
+    bookmarks.release_user_bookmarks(instance)
+
+
+@receiver(post_save, sender=EventChange)
+def publish_event_change(sender, instance, created, **kwargs):
+    """Push every logged event change to open live-update streams once committed"""
+    if created:
+        transaction.on_commit(lambda: live.publish_changes([instance]), using=instance._state.db)
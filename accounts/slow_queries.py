@@ -0,0 +1,253 @@
+"""
+=========================================
+SLOW QUERY LOG WITH EXPLAIN CAPTURE
+=========================================
+
+Database execute wrapper that records every query slower than
+SLOW_QUERY_THRESHOLD_MS together with:
+- the normalized SQL and a short fingerprint of it
+- the call site in project code that issued the query
+- the shape of the parameters (types only, never values)
+- the query plan (``EXPLAIN QUERY PLAN`` on SQLite, ``EXPLAIN`` on Postgres)
+
+Entries are written as JSON lines to the ``studentconnect.slow_queries``
+logger and, when SLOW_QUERY_LOG_FILE is set, appended to that file so the
+``slow_queries`` management command can rank the worst offenders across
+all worker processes. An in-process aggregate (``stats``) is also kept for
+quick inspection from a shell.
+
+The wrapper is attached to every new connection from ``AccountsConfig.ready``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import traceback
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+logger = logging.getLogger("studentconnect.slow_queries")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_local = threading.local()
+
+
+def normalize_sql(sql):
+    """Replace literals and placeholders with ``?`` and collapse IN lists."""
+    normalized = _STRING_LITERAL.sub("?", sql)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _IN_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode("utf-8")).hexdigest()[:12]
+
+
+def params_shape(params, many):
+    """Describe parameters by type only, so no user data ends up in logs."""
+    if params is None:
+        return "none"
+    if many:
+        params = list(params)
+        first = params[0] if params else ()
+        return f"{len(params)} x {params_shape(first, False)}"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in params.items()) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in params) + ")"
+
+
+# Instrumentation layers that wrap every query; never useful as a call site
+_SKIPPED_MODULES = ("slow_queries.py", "performance.py", "middleware.py")
+
+
+def call_site():
+    """Return ``file:line in function`` for the innermost project frame."""
+    base_dir = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if not filename.startswith(base_dir) or "site-packages" in filename:
+            continue
+        if filename.endswith(_SKIPPED_MODULES):
+            continue
+        return f"{os.path.relpath(filename, base_dir)}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+def explain(connection, sql, params):
+    """
+    Return the query plan as a list of lines, or None if it can't be captured.
+
+    Uses a raw backend cursor so the EXPLAIN itself bypasses execute wrappers.
+    """
+    if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    vendor = connection.vendor
+    if vendor == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    elif vendor == "postgresql":
+        prefix = "EXPLAIN "
+    else:
+        return None
+
+    # On Postgres a failed statement aborts the whole transaction
+    use_savepoint = vendor == "postgresql" and connection.in_atomic_block
+    cursor = connection.create_cursor()
+    try:
+        if use_savepoint:
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+        except Exception as exc:
+            if use_savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return [f"EXPLAIN failed: {exc}"]
+        if use_savepoint:
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        cursor.close()
+
+    if vendor == "sqlite":
+        # Rows are (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+class SlowQueryStats:
+    """In-process aggregate of slow queries by fingerprint over a time window."""
+
+    def __init__(self, window_seconds=3600, max_events=10000):
+        self.window_seconds = window_seconds
+        self._events = deque(maxlen=max_events)
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def add(self, entry):
+        with self._lock:
+            self._events.append((entry["timestamp"], entry["fingerprint"], entry["duration_ms"]))
+            self._samples[entry["fingerprint"]] = entry
+
+    def top(self, limit=20, window_seconds=None):
+        cutoff = time.time() - (window_seconds or self.window_seconds)
+        with self._lock:
+            events = [event for event in self._events if event[0] >= cutoff]
+            samples = dict(self._samples)
+        return rank(events, samples, limit)
+
+
+def rank(events, samples, limit=20):
+    """
+    Rank fingerprints by total time spent.
+
+    ``events`` is an iterable of ``(timestamp, fingerprint, duration_ms)`` and
+    ``samples`` maps fingerprints to their latest full log entry.
+    """
+    totals = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+    for _, key, duration in events:
+        row = totals[key]
+        row["count"] += 1
+        row["total_ms"] += duration
+        row["max_ms"] = max(row["max_ms"], duration)
+
+    ranked = []
+    for key, row in totals.items():
+        sample = samples.get(key, {})
+        ranked.append({
+            "fingerprint": key,
+            "count": row["count"],
+            "total_ms": round(row["total_ms"], 1),
+            "avg_ms": round(row["total_ms"] / row["count"], 1),
+            "max_ms": round(row["max_ms"], 1),
+            "sql": sample.get("sql", ""),
+            "call_site": sample.get("call_site", ""),
+            "plan": sample.get("plan"),
+        })
+    ranked.sort(key=lambda row: row["total_ms"], reverse=True)
+    return ranked[:limit]
+
+
+stats = SlowQueryStats()
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    """Execute wrapper logging queries slower than SLOW_QUERY_THRESHOLD_MS."""
+    if getattr(_local, "active", False):
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        threshold = getattr(settings, "SLOW_QUERY_THRESHOLD_MS", 100)
+        if duration_ms >= threshold:
+            _local.active = True
+            try:
+                record(context["connection"], sql, params, many, duration_ms)
+            except Exception:
+                logger.exception("Failed to record slow query")
+            finally:
+                _local.active = False
+
+
+def record(connection, sql, params, many, duration_ms):
+    normalized = normalize_sql(sql)
+    plan = None
+    if getattr(settings, "SLOW_QUERY_EXPLAIN", True) and not many:
+        plan = explain(connection, sql, params)
+
+    entry = {
+        "timestamp": time.time(),
+        "duration_ms": round(duration_ms, 2),
+        "fingerprint": fingerprint(normalized),
+        "sql": normalized,
+        "params": params_shape(params, many),
+        "call_site": call_site(),
+        "database": connection.alias,
+        "plan": plan,
+    }
+    stats.add(entry)
+    line = json.dumps(entry)
+    logger.warning(line)
+
+    log_file = getattr(settings, "SLOW_QUERY_LOG_FILE", None)
+    if log_file:
+        with open(log_file, "a") as handle:
+            handle.write(line + "\n")
+
+
+def read_log(path, since=None):
+    """Yield entries from a SLOW_QUERY_LOG_FILE, optionally newer than ``since``."""
+    with open(path) as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if since is None or entry["timestamp"] >= since:
+                yield entry
+
+
+def _install_wrapper(sender, connection, **kwargs):
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_wrapper)
+
+
+def install():
+    """Attach the wrapper to every database connection as it is opened."""
+    if getattr(settings, "SLOW_QUERY_LOG_ENABLED", True):
+        connection_created.connect(_install_wrapper, dispatch_uid="slow_query_log")
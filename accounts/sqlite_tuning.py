@@ -0,0 +1,103 @@
+"""
+=========================================
+SQLITE CONNECTION TUNING
+=========================================
+
+Applies PRAGMAs to every new SQLite connection so concurrent readers and
+writers stop failing with "database is locked":
+- ``journal_mode=WAL`` lets readers keep reading while one writer commits
+- ``busy_timeout`` makes a blocked writer wait instead of failing at once
+- ``synchronous=NORMAL`` is durable enough in WAL mode and far cheaper
+- ``mmap_size`` / ``cache_size`` keep hot pages in memory
+
+Values come from the SQLITE_* settings (each overridable via environment
+variables in ``settings.py``). The hook is attached from
+``AccountsConfig.ready``; other database vendors are left untouched.
+
+WAL keeps appending to the ``-wal`` file until it is checkpointed, so
+``manage.py sqlite_maintenance`` checkpoints (and optionally vacuums and
+optimizes) the database; ``manage.py sqlite_stress`` runs parallel writers
+to compare behaviour with and without these settings.
+"""
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+def pragmas():
+    """Ordered ``(name, value)`` pairs to apply, from the SQLITE_* settings."""
+    values = [
+        ("journal_mode", getattr(settings, "SQLITE_JOURNAL_MODE", "WAL")),
+        ("busy_timeout", getattr(settings, "SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        ("synchronous", getattr(settings, "SQLITE_SYNCHRONOUS", "NORMAL")),
+        ("mmap_size", getattr(settings, "SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+        ("cache_size", getattr(settings, "SQLITE_CACHE_SIZE", -64000)),
+        ("temp_store", getattr(settings, "SQLITE_TEMP_STORE", "MEMORY")),
+    ]
+    return [(name, value) for name, value in values if value not in (None, "")]
+
+
+def apply_pragmas(raw_connection, values=None):
+    """
+    Run the PRAGMAs on a DB-API sqlite3 connection; returns what SQLite reports.
+
+    Executed on the raw connection so the statements bypass Django's execute
+    wrappers (query timing, slow query log).
+    """
+    applied = {}
+    for name, value in values if values is not None else pragmas():
+        row = raw_connection.execute(f"PRAGMA {name}={value}").fetchone()
+        applied[name] = row[0] if row else value
+    return applied
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    if connection.is_in_memory_db():
+        return  # WAL and mmap do not apply to in-memory test databases
+    apply_pragmas(connection.connection)
+
+
+def install():
+    """Tune every SQLite connection as it is opened."""
+    if getattr(settings, "SQLITE_TUNING_ENABLED", True):
+        connection_created.connect(configure_connection, dispatch_uid="sqlite_tuning")
+
+
+# ----------------------------------------------------------------------
+# Maintenance
+# ----------------------------------------------------------------------
+def checkpoint(connection, mode="TRUNCATE"):
+    """
+    Copy the WAL back into the database file.
+
+    Returns ``(busy, wal_pages, checkpointed_pages)``; ``busy`` is 1 when a
+    reader prevented the checkpoint from completing.
+    """
+    if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+        raise ValueError(f"Unknown checkpoint mode: {mode}")
+    connection.ensure_connection()
+    return tuple(connection.connection.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
+
+
+def database_stats(connection):
+    """Page counts for reporting before and after maintenance."""
+    connection.ensure_connection()
+    raw = connection.connection
+    return {
+        name: raw.execute(f"PRAGMA {name}").fetchone()[0]
+        for name in ("journal_mode", "page_size", "page_count", "freelist_count")
+    }
+
+
+def vacuum(connection):
+    """Rebuild the database file, returning free pages to the filesystem."""
+    connection.ensure_connection()
+    connection.connection.execute("VACUUM")
+
+
+def optimize(connection):
+    """Let SQLite refresh planner statistics where they are stale."""
+    connection.ensure_connection()
+    connection.connection.execute("PRAGMA optimize")
@@ -0,0 +1,121 @@
+"""
+=========================================
+TRENDING EVENTS
+=========================================
+
+The "Trending" strip on the student dashboard: upcoming events ranked by
+recent views and bookmarks, each interaction's weight halving every
+TRENDING_HALF_LIFE_HOURS.
+
+Scores are never recomputed from logs. Each event has one ``EventTrend``
+row holding its decayed ``score`` as of ``scored_at``. An interaction of
+weight ``w`` at time ``t`` is one UPDATE (views arrive in batches from
+``accounts.counters``, bookmarks from each sync):
+
+    score  <-  score * exp(-(t - scored_at) / tau) + w,  scored_at <- t
+
+The row also stores the same score in log space against a fixed epoch:
+
+    rank_key = ln(score) + (scored_at - EPOCH) / tau
+
+Decay moves every event's score by the same factor, so ``rank_key`` never
+changes as time passes and orders events exactly as their current scores
+do. Top-N is therefore a walk down the ``rank_key`` index. Because the
+decayed score at any time is ``exp(rank_key - clock)``, the update is
+written against ``rank_key`` alone, atomically, in SQL. An event's first
+interaction inserts its row with ``score = w`` directly.
+
+PostgreSQL raises an error when ``exp()`` underflows instead of returning
+0, so the exponent is clamped at MIN_EXPONENT: a score that has decayed
+that far is 0 for every purpose here.
+
+``manage.py compact_trending`` periodically rebases ``score``/``scored_at``
+to the present (rank keys are unaffected) and deletes rows that decayed
+below TRENDING_MIN_SCORE or whose event left the feed.
+"""
+
+import datetime
+import math
+
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Exp, Greatest, Ln
+from django.utils import timezone
+
+from .models import EventFeedItem, EventTrend
+
+EPOCH = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+MIN_EXPONENT = -700.0  # exp(-700) ~ 1e-304; below about -745 it underflows
+
+VIEW_WEIGHT = 1.0
+BOOKMARK_WEIGHT = 3.0
+
+
+def _clock(now):
+    """Time since EPOCH in units of the decay constant tau."""
+    tau = settings.TRENDING_HALF_LIFE_HOURS * 3600 / math.log(2)
+    return (now - EPOCH).total_seconds() / tau
+
+
+def _decayed(clock):
+    """Current score of a row, ``exp(rank_key - clock)``, as an expression."""
+    return Exp(Greatest(F("rank_key") - clock, Value(MIN_EXPONENT)))
+
+
+def _bump(now, weight):
+    clock = _clock(now)
+    current = _decayed(clock) + weight
+    return {"score": current, "rank_key": Ln(current) + clock, "scored_at": now}
+
+
+def _new_rows(event_ids, now, weight):
+    rank_key = math.log(weight) + _clock(now)
+    return [EventTrend(event_id=event_id, score=weight, rank_key=rank_key, scored_at=now) for event_id in event_ids]
+
+
+def record(event_ids, weight):
+    """
+    Add an interaction of ``weight`` to each event in ``event_ids``.
+
+    One UPDATE for the events that already have a row, one INSERT for the
+    rest. When two first interactions with an event race, ignore_conflicts
+    keeps the row of the one that inserted first and drops the other's weight.
+    """
+    event_ids = set(event_ids)
+    if not event_ids:
+        return
+    now = timezone.now()
+    existing = set(EventTrend.objects.filter(event_id__in=event_ids).values_list("event_id", flat=True))
+    if existing:
+        EventTrend.objects.filter(event_id__in=existing).update(**_bump(now, weight))
+    if len(existing) < len(event_ids):
+        EventTrend.objects.bulk_create(_new_rows(event_ids - existing, now, weight), ignore_conflicts=True)
+
+
+def _floor(now):
+    """Lowest rank_key still worth showing or keeping."""
+    return _clock(now) + math.log(settings.TRENDING_MIN_SCORE)
+
+
+def top(limit=None, now=None):
+    """Upcoming feed events by current trending score, highest first."""
+    now = now or timezone.now()
+    return (
+        EventFeedItem.objects.upcoming(now)
+        .filter(trend__rank_key__gte=_floor(now))
+        .defer("vector")
+        .order_by("-trend__rank_key")[:limit or settings.TRENDING_SHOWN]
+    )
+
+
+def compact():
+    """
+    Rebase every score to now and drop rows that no longer matter.
+
+    Returns ``(rebased, deleted)`` row counts.
+    """
+    now = timezone.now()
+    deleted, _ = EventTrend.objects.filter(rank_key__lt=_floor(now)).delete()
+    orphans, _ = EventTrend.objects.exclude(event_id__in=EventFeedItem.objects.values("event_id")).delete()
+    rebased = EventTrend.objects.update(score=_decayed(_clock(now)), scored_at=now)
+    return rebased, deleted + orphans
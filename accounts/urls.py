@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 urlpatterns = [
     path('', views.landing, name='landing'),
@@ -20,8 +20,17 @@ urlpatterns = [
     path('delete-event/<int:event_id>/', views.delete_event, name='delete_event'),
     path("save-profile/", views.save_profile, name="save_profile"),
     path("update-profile/", views.update_profile, name="update_profile"),
+    path('events/past/', views.past_events, name='past_events'),
     path('events/<int:event_id>/', views.event_detail, name='event_detail'),
+    path('events/<int:event_id>/register/', views.event_link, name='event_link'),
     path('events/<int:event_id>/deny/', views.deny_event_view, name='deny_event'),
+    path('metrics', views.metrics_view, name='metrics'),
+    path('live/', views.live_updates, name='live_updates'),
+    # Versioned read API for the mobile app and integrations
+    path('api/v1/events/', api.event_list, name='api_event_list'),
+    path('api/v1/events/batch/', api.event_batch, name='api_event_batch'),
+    path('api/v1/events/<int:event_id>/', api.event_detail, name='api_event_detail'),
+    path('api/v1/bookmarks/', api.bookmark_sync, name='api_bookmark_sync'),
     # Removed debug/test routes to keep production clean
     path('organizer-signup/', views.organizer_signup, name='organizer_signup'),  # Redirects to unified signup
 ]
@@ -22,6 +22,8 @@ Security Features:
 - Admin-only view restrictions
 """
 
+import asyncio
+
 # Django core imports for web functionality
 from django.shortcuts import render, redirect
 from django.contrib import messages
@@ -34,10 +36,14 @@ from django.views.decorators.csrf import csrf_protect, ensure_csrf_cookie
 from django.http import JsonResponse
 
 # Local app imports
-from .models import UserProfile, Event
+from .models import UserProfile, Event, EventFeedItem, OrganizerStats
 from .forms import EventForm, DenyEventForm
-from django.shortcuts import get_object_or_404
-from django.http import HttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from django.http import Http404, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.views.decorators.http import require_GET
+from . import analytics, campus, counters, history, live, metrics as app_metrics, profiling, recommendations, related, trending
 import secrets
 
 def is_admin(user):
@@ -384,32 +390,89 @@ def refresh_csrf_token(request):
     return JsonResponse({'status': 'error', 'message': 'Invalid request method'})
 
 
-@login_required
-@ensure_csrf_cookie
-def student_dashboard(request):
-    # Get or create profile, handling potential duplicates
+async def _student_profile(user):
+    """Get or create the student profile, cleaning up duplicates."""
     try:
         # First try to get a profile with an avatar, otherwise get any profile
-        profile = UserProfile.objects.filter(user=request.user, user_type="student").exclude(avatar__exact='').first()
+        profiles = UserProfile.objects.filter(user=user, user_type="student")
+        profile = await profiles.exclude(avatar__exact='').afirst() or await profiles.afirst()
         if not profile:
-            profile = UserProfile.objects.filter(user=request.user, user_type="student").first()
-        if not profile:
-            profile = UserProfile.objects.create(user=request.user, user_type="student")
-        
+            profile = await UserProfile.objects.acreate(user=user, user_type="student")
+
         # Clean up duplicate profiles (keep the one with avatar if it exists, otherwise keep the first one)
-        duplicate_profiles = UserProfile.objects.filter(user=request.user, user_type="student").exclude(id=profile.id)
-        if duplicate_profiles.exists():
-            duplicate_profiles.delete()
+        duplicate_profiles = profiles.exclude(id=profile.id)
+        if await duplicate_profiles.aexists():
+            await duplicate_profiles.adelete()
     except Exception:
-        profile = UserProfile.objects.create(user=request.user, user_type="student")
-    
-    # Only show approved events to students that are not deleted
-    approved_events = Event.objects.filter(status='approved', deleted_at__isnull=True).order_by('-date', '-time')
-    
+        profile = await UserProfile.objects.acreate(user=user, user_type="student")
+    return profile
+
+
+@login_required
+@ensure_csrf_cookie
+@profiling.profile_async_view
+async def student_dashboard(request):
+    # Async so that under ASGI the request never occupies a worker thread
+    # while it waits; independent lookups are awaited together
+    user = await request.auser()
+    request.user = user  # Templates must not lazily load the user on the event loop
+
+    # Students only see approved events that have not started yet; past
+    # events live on the separate, cached history page (past_events).
+    # Cards are read from the precomputed EventFeedItem table: one indexed
+    # range scan on starts_at, no joins
+    approved_events = EventFeedItem.objects.all()
+
+    # Optional narrower window, served by a range scan on starts_at
+    when = request.GET.get('when')
+    if when == 'week':
+        approved_events = approved_events.starting_within(7)
+    else:
+        when = 'upcoming'
+        approved_events = approved_events.upcoming()
+    approved_events = approved_events.order_by('starts_at')
+
+    async def fetch_events():
+        return [event async for event in approved_events]
+
+    async def fetch_trending():
+        return [item async for item in trending.top()]
+
+    profile, events, affinity, trending_events = await asyncio.gather(
+        _student_profile(user), fetch_events(), recommendations.astudent_vector(user), fetch_trending()
+    )
+
+    # "For you" ranks by the student's precomputed affinity vector; students
+    # without one yet keep the soonest-first order
+    sort = 'soonest' if request.GET.get('sort') == 'soonest' or affinity is None else 'for-you'
+    if sort == 'for-you':
+        events = recommendations.rank(events, affinity)
+
     return render(request, "student-dashboard.html", {
-        "user": request.user,
+        "user": user,
         "profile": profile,
-        "events": approved_events
+        "events": events,
+        "when": when,
+        "sort": sort,
+        "personalized": affinity is not None,
+        "trending_events": trending_events,
+    })
+
+
+@login_required
+@require_GET
+@profiling.profile_async_view
+async def past_events(request):
+    """Paginated history of approved events that have already happened."""
+    try:
+        page_number = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page_number = 1
+
+    request.user = await request.auser()
+    return render(request, "past-events.html", {
+        "user": request.user,
+        "page": await history.aget_page(page_number),
     })
 
 
@@ -436,23 +499,28 @@ def organizer_dashboard(request):
     profile.refresh_from_db()
     
     # Get active events for the organizer only
-    active_events = Event.objects.filter(organizer=profile, deleted_at__isnull=True).order_by('-date', '-time')
+    active_events = list(Event.objects.filter(organizer=profile).order_by('-starts_at'))
+
+    # Stored view counts plus this process's views that are not flushed yet
+    for event in active_events:
+        event.views = event.view_count + counters.event_views.pending(event.pk)
+
+    # Daily views, bookmarks and link clicks, read from the rollup tables
+    analytics_data = analytics.dashboard_data(profile, active_events)
     
-    # Count by status for active events
-    total_count = active_events.count()
-    pending_count = active_events.filter(status='pending').count()
-    approved_count = active_events.filter(status='approved').count()
-    denied_count = active_events.filter(status='denied').count()
+    # Count by status for active events (denormalized counters, one PK lookup)
+    stats = OrganizerStats.for_organizer(profile)
     
     return render(request, "organizer-dashboard.html", {
         "user": request.user,
         "profile": profile,
         "events": active_events,  # For backward compatibility
         "active_events": active_events,
-        "total_count": total_count,
-        "pending_count": pending_count,
-        "approved_count": approved_count,
-        "denied_count": denied_count,
+        "total_count": stats.total_count,
+        "pending_count": stats.pending_count,
+        "approved_count": stats.approved_count,
+        "denied_count": stats.denied_count,
+        "analytics": analytics_data,
         "event_form": EventForm()
     })
 
@@ -470,7 +538,7 @@ def create_event(request):
                 event.organizer = organizer_profile
                 # Always set status to pending - only admins can approve events
                 event.status = 'pending'
-                event.save()
+                event.save(actor=request.user)
                 messages.success(request, 'Event created successfully and submitted for admin approval!')
                 return redirect('organizer-dashboard')
             except UserProfile.DoesNotExist:
@@ -565,7 +633,7 @@ def deny_event_view(request, event_id):
         if form.is_valid():
             event.status = 'denied'
             event.denial_reason = form.cleaned_data['denial_reason']
-            event.save()
+            event.save(actor=request.user)
             messages.success(request, f'Event "{event.title}" has been denied.')
             return redirect('/admin/accounts/event/')
     else:
@@ -587,11 +655,11 @@ def edit_event(request, event_id):
     
     # Get the event and ensure it belongs to this organizer
     try:
-        event = Event.objects.get(id=event_id, organizer=organizer_profile, deleted_at__isnull=True)
+        event = Event.objects.get(id=event_id, organizer=organizer_profile)
     except Event.DoesNotExist:
         # Check if event exists at all
         try:
-            existing_event = Event.objects.get(id=event_id)
+            existing_event = Event.objects.with_deleted().get(id=event_id)
             if existing_event.deleted_at is not None:
                 messages.error(request, 'This event has been deleted and cannot be edited.')
             else:
@@ -606,7 +674,7 @@ def edit_event(request, event_id):
             event = form.save(commit=False)
             # Preserve existing status - organizers cannot change approval status
             # Status can only be changed by admins through the admin panel
-            event.save()
+            event.save(actor=request.user)
             messages.success(request, f'Event "{event.title}" has been updated successfully!')
             return redirect('organizer-dashboard')
         else:
@@ -633,7 +701,7 @@ def delete_event(request, event_id):
         return redirect('organizer-dashboard')
     
     # Get the event and ensure it belongs to this organizer
-    event = get_object_or_404(Event, id=event_id, organizer=organizer_profile, deleted_at__isnull=True)
+    event = get_object_or_404(Event, id=event_id, organizer=organizer_profile)
     
     if request.method == 'POST':
         event_title = event.title
@@ -649,17 +717,45 @@ def delete_event(request, event_id):
     })
 
 
-def event_detail(request, event_id):
+@profiling.profile_async_view
+async def event_detail(request, event_id):
     """Display detailed information about a specific event"""
-    event = get_object_or_404(Event, id=event_id, status='approved')
+    # The template shows the organizer's name, so fetch it in the same query
+    event = await aget_object_or_404(
+        Event.objects.select_related('organizer__user'), id=event_id, status='approved'
+    )
+
+    async def fetch_related():
+        return [item async for item in related.for_event(event.id)]
+
+    related_events, request.user = await asyncio.gather(fetch_related(), request.auser())
+
+    # Counted in memory and written behind in batches, off the request path
+    counters.event_views.increment(event.id)
+    if request.user.is_authenticated:
+        # Views by signed-in users feed their personalized ranking
+        counters.student_views.increment((request.user.pk, event.id))
     
     context = {
         'event': event,
+        'related_events': related_events,
     }
     
     return render(request, 'event_detail.html', context)
 
 
+
+@require_GET
+@profiling.profile_async_view
+async def event_link(request, event_id):
+    """Count a click on an event's registration link, then redirect to it"""
+    event = await aget_object_or_404(Event.objects.only('id', 'event_link'), id=event_id, status='approved')
+    if not event.event_link:
+        raise Http404("This event has no registration link")
+    counters.link_clicks.increment(event.id)  # Written behind, like views
+    return HttpResponseRedirect(event.event_link)
+
+
 @login_required
 @csrf_protect
 def update_profile(request):
@@ -777,3 +873,52 @@ def organizer_signup(request):
     })
 
 
+@require_GET
+def metrics_view(request):
+    """
+    Expose application metrics in the Prometheus text format.
+
+    When METRICS_TOKEN is configured the scraper must send it as a
+    ``Authorization: Bearer <token>`` header.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    return HttpResponse(app_metrics.render_latest(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@require_GET
+async def live_updates(request):
+    """
+    Server-sent events stream of event changes for the dashboards.
+
+    Students receive approvals, updates and removals on their campus; with
+    ``?role=organizer`` the stream also carries status changes of the
+    organizer's own events. Only served under ASGI: a WSGI worker would be
+    tied up for the whole connection, so there the client is told (204) to
+    stop reconnecting and fall back to polling.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+
+    organizer_id = None
+    if request.GET.get('role') == 'organizer':
+        organizer_id = await UserProfile.objects.filter(
+            user=user, user_type='organizer'
+        ).values_list('id', flat=True).afirst()
+
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
+
+    response = StreamingHttpResponse(
+        live.stream(campus.current(), organizer_id, last_event_id),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Don't let nginx buffer the stream
+    return response
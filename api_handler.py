@@ -1,7 +1,11 @@
 import requests
 import os
+from asgiref.sync import sync_to_async
 from dotenv import load_dotenv
 
+from accounts.metrics import count_api_call
+from accounts.performance import timed
+
 load_dotenv()
 
 class APIHandler:
@@ -9,6 +13,8 @@ class APIHandler:
         self.weather_api_key = os.getenv('WEATHER_API_KEY')
         self.news_api_key = os.getenv('NEWS_API_KEY')
     
+    @timed("api")
+    @count_api_call("weather")
     def get_weather(self, city="London"):
         """Fetch weather data from OpenWeatherMap API"""
         try:
@@ -24,6 +30,8 @@ class APIHandler:
             print(f"Weather API error: {e}")
             return None
     
+    @timed("api")
+    @count_api_call("news")
     def get_news(self, query="technology", limit=5):
         """Fetch news from NewsAPI"""
         try:
@@ -40,6 +48,8 @@ class APIHandler:
             print(f"News API error: {e}")
             return None
     
+    @timed("api")
+    @count_api_call("quote")
     def get_random_quote(self):
         """Fetch random quote from free API"""
         try:
@@ -49,3 +59,15 @@ class APIHandler:
         except Exception as e:
             print(f"Quote API error: {e}")
             return None
+
+    # Async variants for async views. Each blocking call gets a thread of its
+    # own (thread_sensitive=False), so several widgets can be fetched with
+    # asyncio.gather alongside ORM queries instead of one after another.
+    async def aget_weather(self, city="London"):
+        return await sync_to_async(self.get_weather, thread_sensitive=False)(city)
+
+    async def aget_news(self, query="technology", limit=5):
+        return await sync_to_async(self.get_news, thread_sensitive=False)(query, limit)
+
+    async def aget_random_quote(self):
+        return await sync_to_async(self.get_random_quote, thread_sensitive=False)()
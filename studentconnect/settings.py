@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os 
 from pathlib import Path
 
+from decouple import Csv, config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -41,6 +43,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "accounts.middleware.CampusMiddleware",
+    "accounts.middleware.ServerTimingMiddleware",
+    "accounts.middleware.MetricsMiddleware",
+    "accounts.middleware.ProfilingMiddleware",
+    "accounts.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -54,7 +61,7 @@ ROOT_URLCONF = "studentconnect.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "accounts.performance.TimedDjangoTemplates",
         "DIRS": [BASE_DIR / 'templates'],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -75,14 +82,124 @@ WSGI_APPLICATION = "studentconnect.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+#
+# Configured from the environment (or a .env file) via python-decouple.
+# SQLite is the default; set DB_ENGINE=django.db.backends.postgresql plus
+# DB_NAME/DB_USER/DB_PASSWORD/DB_HOST/DB_PORT for Postgres
+# (pip install -r requirements-postgres.txt). Compare connection strategies
+# with `manage.py bench_db_connections`.
+
+DB_ENGINE = config('DB_ENGINE', default='django.db.backends.sqlite3')
+DB_IS_SQLITE = DB_ENGINE == 'django.db.backends.sqlite3'
+
+# Seconds to keep a connection open between requests (0 = reconnect every
+# request, None = forever); health checks re-validate reused connections
+DB_CONN_MAX_AGE = config(
+    'DB_CONN_MAX_AGE',
+    default=0 if DB_IS_SQLITE else 60,
+    cast=lambda value: None if str(value).strip().lower() == 'none' else int(value),
+)
+DB_CONN_HEALTH_CHECKS = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+
+# Django's native psycopg connection pool (Postgres only). A pooled
+# connection is returned to the pool at the end of each request, so it
+# replaces CONN_MAX_AGE, which must then be 0
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', default=2, cast=int)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=10, cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10, cast=int)
+
+SQLITE_BUSY_TIMEOUT_MS = config('SQLITE_BUSY_TIMEOUT_MS', default=5000, cast=int)
+
+if DB_IS_SQLITE:
+    _default_db = {
+        "ENGINE": DB_ENGINE,
+        "NAME": config('DB_NAME', default=str(BASE_DIR / "db.sqlite3")),
+        "OPTIONS": {
+            # Take the write lock when a transaction starts, so concurrent
+            # writers wait on busy_timeout instead of failing on lock upgrade
+            "transaction_mode": config('SQLITE_TRANSACTION_MODE', default='IMMEDIATE'),
+            "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+    }
+else:
+    _default_db = {
+        "ENGINE": DB_ENGINE,
+        "NAME": config('DB_NAME', default='studentconnect'),
+        "USER": config('DB_USER', default='studentconnect'),
+        "PASSWORD": config('DB_PASSWORD', default=''),
+        "HOST": config('DB_HOST', default='localhost'),
+        "PORT": config('DB_PORT', default='5432'),
+        "OPTIONS": {
+            "connect_timeout": config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+        },
+    }
+    if DB_POOL:
+        _default_db["OPTIONS"]["pool"] = {
+            "min_size": DB_POOL_MIN_SIZE,
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": DB_POOL_TIMEOUT,
+        }
+        DB_CONN_MAX_AGE = 0
+
+_default_db["CONN_MAX_AGE"] = DB_CONN_MAX_AGE
+_default_db["CONN_HEALTH_CHECKS"] = DB_CONN_HEALTH_CHECKS
 
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": _default_db,
 }
 
+# Optional read replica for read-heavy views (accounts/routers.py). Locally,
+# point DATABASE_REPLICA_NAME at a second SQLite file and keep it in sync
+# with `manage.py sync_replica --interval 5`; on Postgres also set
+# DATABASE_REPLICA_HOST
+DATABASE_REPLICA_NAME = config('DATABASE_REPLICA_NAME', default='') or None
+if DATABASE_REPLICA_NAME:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': DATABASE_REPLICA_NAME,
+        'TEST': {'MIRROR': 'default'},
+    }
+    if not DB_IS_SQLITE:
+        DATABASES['replica']['HOST'] = config('DATABASE_REPLICA_HOST', default=DATABASES['default']['HOST'])
+DATABASE_REPLICAS = ['replica'] if DATABASE_REPLICA_NAME else []
+DATABASE_ROUTERS = ['accounts.campus.CampusRouter', 'accounts.routers.ReplicaRouter']
+DATABASE_REPLICA_VIEWS = ['student-dashboard', 'event_detail', 'event_link', 'past_events', 'api_event_list', 'api_event_detail', 'api_event_batch']
+DATABASE_REPLICA_MODELS = [
+    'accounts.Event', 'accounts.EventFeedItem', 'accounts.ArchivedEvent', 'accounts.EventChange',
+    'accounts.StudentAffinity', 'accounts.RelatedEvent',
+]
+DATABASE_REPLICA_STICKY_SECONDS = config('DATABASE_REPLICA_STICKY_SECONDS', default=10, cast=int)
+
+# Multi-campus sharding (accounts/campus.py). The default campus lives in the
+# default database; list extra campuses in CAMPUS_SHARDS (e.g. "north,south")
+# and give each CAMPUS_<SLUG>_HOSTS and optionally CAMPUS_<SLUG>_DB
+# (and CAMPUS_<SLUG>_DB_HOST on Postgres).
+# Campuses are also reachable under /c/<slug>/ on any host.
+CAMPUS_DEFAULT = config('CAMPUS_DEFAULT', default='main')
+CAMPUSES = {CAMPUS_DEFAULT: {'database': 'default', 'hosts': []}}
+for _slug in config('CAMPUS_SHARDS', default='', cast=Csv()):
+    _prefix = f'CAMPUS_{_slug.upper()}'
+    DATABASES[f'campus_{_slug}'] = {
+        **DATABASES['default'],
+        'NAME': config(f'{_prefix}_DB', default=str(BASE_DIR / f'db_{_slug}.sqlite3') if DB_IS_SQLITE else f'studentconnect_{_slug}'),
+    }
+    if not DB_IS_SQLITE:
+        DATABASES[f'campus_{_slug}']['HOST'] = config(f'{_prefix}_DB_HOST', default=DATABASES['default']['HOST'])
+    _hosts = config(f'{_prefix}_HOSTS', default='', cast=Csv())
+    CAMPUSES[_slug] = {'database': f'campus_{_slug}', 'hosts': _hosts}
+    ALLOWED_HOSTS += _hosts
+# Per-campus time budget for cross-campus admin stats
+CAMPUS_FAN_OUT_TIMEOUT = config('CAMPUS_FAN_OUT_TIMEOUT', default=2.0, cast=float)
+
+# SQLite PRAGMAs applied to every new connection (accounts/sqlite_tuning.py);
+# checkpoint the WAL regularly with `manage.py sqlite_maintenance`
+SQLITE_TUNING_ENABLED = config('SQLITE_TUNING_ENABLED', default=True, cast=bool)
+SQLITE_JOURNAL_MODE = config('SQLITE_JOURNAL_MODE', default='WAL')
+SQLITE_SYNCHRONOUS = config('SQLITE_SYNCHRONOUS', default='NORMAL')
+SQLITE_MMAP_SIZE = config('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int)
+SQLITE_CACHE_SIZE = config('SQLITE_CACHE_SIZE', default=-64000, cast=int)  # negative = KiB
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -150,3 +267,111 @@ CSRF_TRUSTED_ORIGINS = [
     'http://127.0.0.1:8000',
     'http://localhost:8000',
 ]
+
+# Events that started longer ago than this are moved to the archive table
+# by `manage.py archive_events` (soft-deleted events are archived regardless)
+EVENT_ARCHIVE_RETENTION_DAYS = config('EVENT_ARCHIVE_RETENTION_DAYS', default=180, cast=int)
+
+# Local-memory cache by default; point CACHE_LOCATION at a shared backend
+# (e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache) in production
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='studentconnect'),
+    }
+}
+
+# Past events history page (/events/past/); pages are cached aggressively
+# and invalidated whenever a past event changes
+PAST_EVENTS_PAGE_SIZE = config('PAST_EVENTS_PAGE_SIZE', default=20, cast=int)
+PAST_EVENTS_CACHE_TIMEOUT = config('PAST_EVENTS_CACHE_TIMEOUT', default=24 * 3600, cast=int)
+
+# Event read API (/api/v1/events/): default and maximum page size, and
+# the most ids one batch lookup may ask for
+API_PAGE_SIZE = config('API_PAGE_SIZE', default=20, cast=int)
+API_MAX_PAGE_SIZE = config('API_MAX_PAGE_SIZE', default=100, cast=int)
+API_BATCH_MAX_IDS = config('API_BATCH_MAX_IDS', default=100, cast=int)
+# Most add/remove operations accepted by one bookmark sync
+API_BOOKMARK_SYNC_MAX_OPERATIONS = config('API_BOOKMARK_SYNC_MAX_OPERATIONS', default=500, cast=int)
+
+# Personalized feed ranking (accounts/recommendations.py): how fast old
+# bookmarks and views stop counting toward a student's affinity vector.
+# Vectors are rebuilt by manage.py build_affinity_vectors (e.g. nightly)
+RECOMMENDATION_HALF_LIFE_DAYS = config('RECOMMENDATION_HALF_LIFE_DAYS', default=90, cast=float)
+
+# "Similar events" on the event detail page (accounts/related.py): lists
+# kept per event, and how many are shown. Refreshed incrementally by
+# manage.py build_related_events (e.g. every few minutes)
+RELATED_EVENTS_TOP_K = config('RELATED_EVENTS_TOP_K', default=10, cast=int)
+RELATED_EVENTS_SHOWN = config('RELATED_EVENTS_SHOWN', default=4, cast=int)
+
+# "Trending" on the student dashboard (accounts/trending.py): how fast
+# interactions fade, how many events are shown, and the decayed score below
+# which an event stops trending. manage.py compact_trending (e.g. hourly)
+# rebases scores and drops cold rows
+TRENDING_HALF_LIFE_HOURS = config('TRENDING_HALF_LIFE_HOURS', default=24, cast=float)
+TRENDING_SHOWN = config('TRENDING_SHOWN', default=5, cast=int)
+TRENDING_MIN_SCORE = config('TRENDING_MIN_SCORE', default=0.5, cast=float)
+
+# Write-behind counters (accounts/counters.py): buffered event views are
+# flushed every COUNTER_FLUSH_INTERVAL seconds, or once this many are pending
+COUNTER_FLUSH_INTERVAL = config('COUNTER_FLUSH_INTERVAL', default=5, cast=float)
+COUNTER_FLUSH_MAX_PENDING = config('COUNTER_FLUSH_MAX_PENDING', default=1000, cast=int)
+
+# Organizer analytics (accounts/analytics.py): days charted on the
+# dashboard, and how long rolled-up raw log rows are kept. Run
+# manage.py rollup_analytics periodically (e.g. every 10 minutes)
+ANALYTICS_CHART_DAYS = config('ANALYTICS_CHART_DAYS', default=30, cast=int)
+ANALYTICS_LOG_RETENTION_DAYS = config('ANALYTICS_LOG_RETENTION_DAYS', default=7, cast=int)
+
+# Live dashboard updates over server-sent events (/live/, ASGI only).
+# Use accounts.live.DatabaseBackend when running several worker processes
+LIVE_UPDATES_BACKEND = config('LIVE_UPDATES_BACKEND', default='accounts.live.InProcessBackend')
+LIVE_UPDATES_POLL_INTERVAL = config('LIVE_UPDATES_POLL_INTERVAL', default=1.0, cast=float)
+LIVE_UPDATES_HEARTBEAT = 15
+LIVE_UPDATES_MAX_SECONDS = config('LIVE_UPDATES_MAX_SECONDS', default=600, cast=int)
+
+# Per-request performance instrumentation (Server-Timing header + log line)
+# Every request is sampled with DEBUG on; otherwise 1% by default, raise
+# PERF_TIMING_SAMPLE_RATE (e.g. 0.05 for 5%) while investigating. The
+# Server-Timing header is only sent to clients by default with DEBUG on
+PERF_TIMING_ENABLED = config('PERF_TIMING_ENABLED', default=True, cast=bool)
+PERF_TIMING_SAMPLE_RATE = config('PERF_TIMING_SAMPLE_RATE', default=1.0 if DEBUG else 0.01, cast=float)
+PERF_TIMING_HEADER = config('PERF_TIMING_HEADER', default=DEBUG, cast=bool)
+
+# Prometheus-style /metrics endpoint
+# Set METRICS_MULTIPROC_DIR to a shared directory when running several workers
+METRICS_MULTIPROC_DIR = config('METRICS_MULTIPROC_DIR', default='') or None
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5, cast=float)
+# Optional bearer token required to scrape /metrics
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Sampling profiler; captured profiles are browsable at /admin/ops/profiles/
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_VIEW_RATES = {}  # e.g. {'student-dashboard': 0.05}
+PROFILING_THRESHOLD_MS = config('PROFILING_THRESHOLD_MS', default=0, cast=float)
+PROFILING_SAMPLE_INTERVAL = 0.005
+PROFILING_DIR = config('PROFILING_DIR', default=str(BASE_DIR / 'profiles'))
+PROFILING_MAX_FILES = config('PROFILING_MAX_FILES', default=200, cast=int)
+
+# Slow query log with EXPLAIN capture; rank offenders with `manage.py slow_queries`
+SLOW_QUERY_LOG_ENABLED = config('SLOW_QUERY_LOG_ENABLED', default=True, cast=bool)
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=100, cast=float)
+SLOW_QUERY_EXPLAIN = config('SLOW_QUERY_EXPLAIN', default=True, cast=bool)
+SLOW_QUERY_LOG_FILE = config('SLOW_QUERY_LOG_FILE', default='') or None
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {'format': '%(asctime)s %(levelname)s %(name)s %(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'plain'},
+    },
+    'loggers': {
+        'studentconnect.performance': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+        'studentconnect.slow_queries': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
@@ -19,8 +19,11 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
+from accounts.admin import admin_site
 
 urlpatterns = [
+    # Operational tools (profile browser) on the custom admin site
+    path("admin/ops/", admin_site.urls),
     path("admin/", admin.site.urls),
     path('', include('accounts.urls')),
 ]+ static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)